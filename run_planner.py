@@ -1,10 +1,11 @@
 # run_planner.py
 
+import sys
 from src.core.planner import TripPlanningSystem
-from sample_data import DEFAULT_LOCATIONS, DEFAULT_REQUIREMENT
+from sample_data import DEFAULT_REQUIREMENT, get_default_locations
 
 
-def main():
+def main(verbose: bool = True):
     """主程式入口
 
     這是系統的啟動點，負責：
@@ -12,33 +13,44 @@ def main():
     2. 讀取必要的資料
     3. 執行規劃流程
     4. 處理可能的錯誤
+
+    輸入參數:
+        verbose: bool - 是否輸出規劃參數與行程內容，
+                 批次執行或由其他程式呼叫時可設為 False
+
+    回傳:
+        List[Dict]: 規劃好的行程列表
     """
     try:
         # 初始化規劃系統
         system = TripPlanningSystem()
-
-        # 顯示規劃參數
-        print("=== 行程規劃系統 ===")
-        print(f"起點：{DEFAULT_REQUIREMENT['start_point']}")
-        print(f"時間：{DEFAULT_REQUIREMENT['start_time']} - "
-              f"{DEFAULT_REQUIREMENT['end_time']}")
-        print(f"午餐：{DEFAULT_REQUIREMENT['lunch_time']}")
-        print(f"晚餐：{DEFAULT_REQUIREMENT['dinner_time']}")
-        print(f"景點數量：{len(DEFAULT_LOCATIONS)}個")
-        print(f"交通方式：{DEFAULT_REQUIREMENT['transport_mode']}")
-
-        print("\n開始規劃行程...")
+        locations = get_default_locations()
+
+        # 顯示規劃參數，組好後一次寫入標準輸出
+        if verbose:
+            sys.stdout.write(
+                "=== 行程規劃系統 ===\n"
+                f"起點：{DEFAULT_REQUIREMENT['start_point']}\n"
+                f"時間：{DEFAULT_REQUIREMENT['start_time']} - "
+                f"{DEFAULT_REQUIREMENT['end_time']}\n"
+                f"午餐：{DEFAULT_REQUIREMENT['lunch_time']}\n"
+                f"晚餐：{DEFAULT_REQUIREMENT['dinner_time']}\n"
+                f"景點數量：{len(locations)}個\n"
+                f"交通方式：{DEFAULT_REQUIREMENT['transport_mode']}\n"
+                "\n開始規劃行程...\n"
+            )
 
         # 執行行程規劃
         result = system.plan_trip(
-            locations=DEFAULT_LOCATIONS,
+            locations=locations,
             requirement=DEFAULT_REQUIREMENT
         )
 
         # 輸出結果
-        system.print_itinerary(result, show_navigation=False)
-        import pprint
-        # pprint.pprint(result)
+        if verbose:
+            system.print_itinerary(result, show_navigation=False)
+
+        return result
 
     except Exception as e:
         print(f"\n發生錯誤: {str(e)}")
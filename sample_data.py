@@ -1,9 +1,15 @@
 # sample_data.py
 
 import ast
+import hashlib
+import json
 import os
-from typing import List, Dict
-import pandas as pd
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # 預設行程需求
 DEFAULT_REQUIREMENT = {
@@ -21,7 +27,23 @@ DEFAULT_REQUIREMENT = {
 }
 
 
-def process_csv(filepath: str) -> pd.DataFrame:
+# 營業時間字串中的星期鍵值（例如 "{1: [" 中的 1），轉為 JSON 時需要加上引號
+_DAY_KEY_PATTERN = re.compile(r'([{,]\s*)(\d+):')
+
+
+# 時段排序順序
+_PERIOD_ORDER = {
+    period: i for i, period in
+    enumerate(['morning', 'lunch', 'afternoon', 'dinner', 'night'])
+}
+
+
+# 沒有營業時間資料的日子視為全天營業，所有地點共用同一組時段；
+# 使用 tuple，避免呼叫端以 append 等方式原地修改而影響其他地點
+ALWAYS_OPEN_SLOTS = ({'start': '00:00', 'end': '23:59'},)
+
+
+def process_csv(filepath: str) -> 'pd.DataFrame':
     """處理景點資料的CSV檔案
 
     輸入:
@@ -37,63 +59,113 @@ def process_csv(filepath: str) -> pd.DataFrame:
         - period: 時段標記
         - hours: 營業時間(dict)
     """
-    df = pd.read_csv(filepath)
+    # 只有重建資料時才需要 pandas，讀取快照時不必載入
+    import pandas as pd
+
+    # 只讀取需要的欄位並直接指定數值型別，讀取後不必再轉換一次
+    df = pd.read_csv(
+        filepath,
+        engine='c',
+        usecols=['place_id', 'place_name', 'rating',
+                 'lat', 'lon', 'label', 'period', 'hours'],
+        dtype={'rating': 'float64', 'lat': 'float64', 'lon': 'float64'}
+    )
+
+    # 解析失敗的營業時間字串，全部處理完後只輸出一次
+    failures = []
 
     def convert_hours(hours_str):
+        # CSV 中是 Python 字典語法，先改寫成 JSON 交給 C 實作的解析器，
+        # 比 literal_eval 逐一走訪語法樹快得多；無法轉換時才退回 literal_eval
+        try:
+            hours = json.loads(_DAY_KEY_PATTERN.sub(
+                r'\1"\2":',
+                hours_str.replace("'", '"').replace('None', 'null')))
+            return {int(day): slots for day, slots in hours.items()}
+        except (AttributeError, ValueError):
+            pass
         try:
             return ast.literal_eval(hours_str)
-        except:
-            print(f"Error parsing hours: {hours_str}")
+        except (ValueError, SyntaxError, TypeError):
+            failures.append(hours_str)
             return {}
 
     processed_df = pd.DataFrame({
         'placeID': df['place_id'],
         'name': df['place_name'],
-        'rating': df['rating'].astype(float),
-        'lat': df['lat'].astype(float),
-        'lon': df['lon'].astype(float),
+        'rating': df['rating'],
+        'lat': df['lat'],
+        'lon': df['lon'],
         'label': df['label'],
         'period': df['period'],
         'hours': df['hours'].apply(convert_hours)
     })
 
+    if failures:
+        print(f"無法解析 {len(failures)} 筆營業時間資料，"
+              f"例如: {failures[0]!r}")
+
     return processed_df
 
 
+# 各類型地點的建議停留時間（分鐘）
+_DURATIONS = {
+    # 正餐餐廳 (90分鐘)
+    90: [
+        '中菜館', '中餐館', '台灣餐廳', '壽司店',
+        '多國菜餐廳', '意大利餐廳', '日本餐廳',
+        '泰國餐廳', '海鮮餐廳', '港式茶餐廳',
+        '火鍋餐廳', '燒烤餐廳', '美式牛扒屋',
+        '純素餐廳', '素食餐廳', '餐廳'
+    ],
+    # 快速餐飲 (45分鐘)
+    45: [
+        '小食/零食吧', '快餐店', '立食吧',
+        '自助餐餐廳', '麵店'
+    ],
+    # 小吃/串燒 (30分鐘)
+    30: [
+        '小吃攤', '串燒烤肉店', '日式烤雞串餐廳',
+        '炸物串與串炸餐廳'
+    ],
+    # 景點 (120分鐘)
+    120: ['景點', '旅遊景點'],
+    # 酒吧休閒 (60分鐘)
+    60: ['酒吧', '酒吧扒房', '居酒屋']
+}
+
+# 以標籤為鍵值的反查表，查詢時只需一次雜湊
+LABEL_TO_DURATION: Dict[str, int] = {
+    label: duration
+    for duration, labels in _DURATIONS.items()
+    for label in labels
+}
+
+
 def get_duration_by_label(label: str) -> int:
-    """根據地點標籤返回建議停留時間（分鐘）"""
-    durations = {
-        # 正餐餐廳 (90分鐘)
-        90: [
-            '中菜館', '中餐館', '台灣餐廳', '壽司店',
-            '多國菜餐廳', '意大利餐廳', '日本餐廳',
-            '泰國餐廳', '海鮮餐廳', '港式茶餐廳',
-            '火鍋餐廳', '燒烤餐廳', '美式牛扒屋',
-            '純素餐廳', '素食餐廳', '餐廳'
-        ],
-        # 快速餐飲 (45分鐘)
-        45: [
-            '小食/零食吧', '快餐店', '立食吧',
-            '自助餐餐廳', '麵店'
-        ],
-        # 小吃/串燒 (30分鐘)
-        30: [
-            '小吃攤', '串燒烤肉店', '日式烤雞串餐廳',
-            '炸物串與串炸餐廳'
-        ],
-        # 景點 (120分鐘)
-        120: ['景點', '旅遊景點'],
-        # 酒吧休閒 (60分鐘)
-        60: ['酒吧', '酒吧扒房', '居酒屋']
-    }
+    """根據地點標籤返回建議停留時間（分鐘），未知標籤預設 60 分鐘"""
+    return LABEL_TO_DURATION.get(label, 60)
+
+
+def fill_missing_days(hours: Dict) -> Dict:
+    """補齊一週七天的營業時間
+
+    沒有資料、為 None 或 [None] 的日子視為全天營業
 
-    for duration, labels in durations.items():
-        if label in labels:
-            return duration
-    return 60  # 預設 60 分鐘
+    輸入:
+        hours: 營業時間字典（會直接修改）
+
+    輸出:
+        Dict: 同一個營業時間字典
+    """
+    for day in range(1, 8):
+        slots = hours.get(day)
+        if slots is None or slots == [None]:
+            hours[day] = ALWAYS_OPEN_SLOTS
+    return hours
 
 
-def convert_to_place_list(df: pd.DataFrame) -> List[Dict]:
+def convert_to_place_list(df: 'pd.DataFrame') -> List[Dict]:
     """將DataFrame轉換為地點列表
 
     輸入:
@@ -102,32 +174,16 @@ def convert_to_place_list(df: pd.DataFrame) -> List[Dict]:
     輸出:
         List[Dict]: 地點資料列表，依照時段分類整理
     """
-    places = []
-
-    for _, row in df.iterrows():
-        # 取得停留時間
-        duration = get_duration_by_label(row['label'])
-
-        # 處理營業時間
-        hours = row['hours']
-        for day in range(1, 8):
-            if day not in hours or hours[day] is None:
-                hours[day] = [{'start': '00:00', 'end': '23:59'}]
-            elif hours[day] == [None]:
-                hours[day] = [{'start': '00:00', 'end': '23:59'}]
-
-        place = {
-            "placeID": row['placeID'],
-            "name": row['name'],
-            "rating": float(row['rating']),
-            "lat": float(row['lat']),
-            "lon": float(row['lon']),
-            "duration": duration,
-            "label": row['label'],
-            "period": row['period'],
-            "hours": hours
-        }
-        places.append(place)
+    # 停留時間依標籤查表，整個欄位一次對應，未知標籤預設 60 分鐘
+    df = df.assign(
+        duration=df['label'].map(LABEL_TO_DURATION).fillna(60).astype(int))
+
+    # 營業時間補齊後再一次轉成字典列表，不逐列建立 Series 或逐筆 append
+    df = df.assign(hours=[fill_missing_days(hours) for hours in df['hours']])
+    places = df[[
+        'placeID', 'name', 'rating', 'lat', 'lon',
+        'duration', 'label', 'period', 'hours'
+    ]].to_dict(orient='records')
 
     return sort_places_by_period(places)
 
@@ -141,18 +197,132 @@ def sort_places_by_period(places: List[Dict]) -> List[Dict]:
     輸出:
         List[Dict]: 依照時段排序後的地點列表
     """
-    # 定義時段順序
-    period_order = ['morning', 'lunch', 'afternoon', 'dinner', 'night']
+    # 依照時段排序，以查表取得順序，不必每次線性搜尋
+    return sorted(places, key=lambda x: _PERIOD_ORDER[x['period']])
+
+
+def _file_digest(filepath: str) -> str:
+    """計算檔案內容的 SHA-1，用來判斷快照是否與 CSV 一致"""
+    with open(filepath, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
 
-    # 依照時段排序
-    return sorted(places, key=lambda x: period_order.index(x['period']))
+
+def build_snapshot(csv_path: str, snapshot_path: str) -> List[Dict]:
+    """由 CSV 產生地點資料快照
+
+    解析 CSV 需要 pandas 與 literal_eval，成本集中在這一步；
+    之後載入時直接讀取 JSON 即可
+
+    輸入:
+        csv_path: 景點資料的 CSV 檔案路徑
+        snapshot_path: 快照 JSON 的輸出路徑
+
+    輸出:
+        List[Dict]: 地點資料列表
+    """
+    places = convert_to_place_list(process_csv(csv_path))
+
+    stat = os.stat(csv_path)
+    snapshot = {
+        "source_sha1": _file_digest(csv_path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "locations": places
+    }
+    with open(snapshot_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+
+    return places
+
+
+def load_snapshot(csv_path: str, snapshot_path: str) -> Optional[List[Dict]]:
+    """讀取地點資料快照
+
+    快照不存在或與目前的 CSV 內容不一致時回傳 None。
+    CSV 的大小與修改時間和建立快照時相同就直接採用，
+    不同時（例如重新 checkout）才讀取整個檔案比對 SHA-1
+
+    輸出:
+        Optional[List[Dict]]: 地點資料列表
+    """
+    if not os.path.exists(snapshot_path):
+        return None
+
+    with open(snapshot_path, encoding='utf-8') as f:
+        snapshot = json.load(f)
+
+    stat = os.stat(csv_path)
+    unchanged = (snapshot.get("source_size") == stat.st_size and
+                 snapshot.get("source_mtime_ns") == stat.st_mtime_ns)
+    if not unchanged and snapshot.get("source_sha1") != _file_digest(csv_path):
+        return None
+
+    places = snapshot["locations"]
+    for place in places:
+        # JSON 的鍵值一律是字串，轉回 1-7 的星期整數
+        place["hours"] = {
+            int(day): slots for day, slots in place["hours"].items()
+        }
+    return places
+
+
+def intern_hours(places: List[Dict]) -> List[Dict]:
+    """讓內容相同的每日營業時段共用同一個 tuple
+
+    大部分地點一週七天的營業時間都相同，
+    共用後每種營業時段只保留一份，也可以用 `is` 快速比較；
+    共用的是不可變的 tuple，不會因為修改某個地點的時段列表而影響其他地點
+
+    輸入:
+        places: 地點列表（會直接修改其中的 hours）
+
+    輸出:
+        List[Dict]: 同一個地點列表
+    """
+    interned = {}
+    for place in places:
+        hours = place['hours']
+        for day, slots in hours.items():
+            key = tuple(
+                (slot['start'], slot['end']) if slot else None
+                for slot in slots
+            )
+            hours[day] = interned.setdefault(key, tuple(slots))
+    return places
+
+
+def load_locations(csv_path: str, snapshot_path: str) -> List[Dict]:
+    """載入地點資料，優先使用快照，否則直接解析 CSV"""
+    places = load_snapshot(csv_path, snapshot_path)
+    if places is None:
+        places = convert_to_place_list(process_csv(csv_path))
+    return intern_hours(places)
 
 
 # 取得目前檔案的目錄
 current_dir = os.path.dirname(os.path.abspath(__file__))
 file_path = os.path.join(current_dir, "sample_data.csv")
+snapshot_path = os.path.join(current_dir, "sample_data.json")
+
+
+@lru_cache(maxsize=1)
+def get_default_locations() -> List[Dict]:
+    """取得預設地點資料
+
+    第一次呼叫時才載入，之後重複使用同一份列表，
+    import 本模組時不會讀取任何檔案
+    """
+    return load_locations(file_path, snapshot_path)
+
+
+def __getattr__(name: str):
+    """保留 DEFAULT_LOCATIONS 的舊用法，存取時才載入資料"""
+    if name == "DEFAULT_LOCATIONS":
+        return get_default_locations()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# 建立預設資料
-df = process_csv(file_path)
 
-DEFAULT_LOCATIONS = convert_to_place_list(df)
+if __name__ == "__main__":
+    # 修改 sample_data.csv 後執行 python sample_data.py 重建快照
+    locations = build_snapshot(file_path, snapshot_path)
+    print(f"已建立 {snapshot_path}，共 {len(locations)} 個地點")
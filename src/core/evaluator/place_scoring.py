@@ -1,11 +1,54 @@
 # src/core/evaluator/place_scoring.py
 
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass
+import numpy as np
 from ..models.place import PlaceDetail
+from ..models.place_arrays import PlaceArrays, PERIOD_CODES
 from ..services.time_service import TimeService
 from ..services.geo_service import GeoService
+from ..utils.distance_matrix import DistanceMatrix
+
+
+# 效率與距離評分中要調整期望值的地點類型
+_SIGHT_LABELS = frozenset(('景點', '主要景點'))
+_MEAL_LABELS = frozenset(('餐廳', '小吃'))
+
+# 以下評分規則由逐一評分與向量化評分共用，修改時兩者會一起生效
+
+# 基礎評分：原始評分的滿分、無評分時的分數，以及高評分加分的門檻與比例
+_MAX_RATING = 5.0
+_NO_RATING_SCORE = 0.5
+_RATING_BONUS_THRESHOLD = 4.5
+_RATING_BONUS_RATE = 0.1
+
+# 時間效率：景點可以接受較低的效率，用餐地點要求較高效率
+_SIGHT_EFFICIENCY_FACTOR = 0.8
+_MEAL_EFFICIENCY_FACTOR = 1.2
+
+# 距離合理性：預設最大可接受距離（公里），景點可以接受較遠，餐飲地點要求較近
+_MAX_DISTANCE = 30.0
+_SIGHT_DISTANCE_FACTOR = 1.2
+_MEAL_DISTANCE_FACTOR = 0.8
+
+# 營業時段適合度：剩餘時間不到停留時間的這個倍數時視為稍嫌緊湊
+_SLOT_TIGHT_FACTOR = 1.5
+_SLOT_TIGHT_SCORE = 0.5
+
+# 目前時段與地點建議時段的基本分數，依兩者相差的時段數預先算好：
+# 相同時段為 1，每差一個時段少 0.2，最低 0.3
+_PERIOD_BASE_SCORES = {
+    (current, period): max(0.3, 1.0 - abs(i - j) * 0.2)
+    for i, current in enumerate(TimeService.PERIODS)
+    for j, period in enumerate(TimeService.PERIODS)
+}
+
+# 同一張表的陣列形式，以 [目前時段代碼, 地點時段代碼] 查詢
+_PERIOD_BASE_TABLE = np.array([
+    [_PERIOD_BASE_SCORES[current, period] for period in TimeService.PERIODS]
+    for current in TimeService.PERIODS
+])
 
 
 @dataclass
@@ -45,7 +88,8 @@ class PlaceScoring:
                         place: PlaceDetail,
                         current_location: PlaceDetail,
                         current_time: datetime,
-                        travel_time: float) -> float:
+                        travel_time: float,
+                        distance: Optional[float] = None) -> float:
         """計算地點的綜合評分
 
         整合所有評分因素，產生一個最終評分：
@@ -59,6 +103,7 @@ class PlaceScoring:
             current_location: 當前位置
             current_time: 當前時間
             travel_time: 預估交通時間（分鐘）
+            distance: 已算好的直線距離（公里），未提供時才即時計算
 
         回傳：
             float: 0-1 之間的評分，或 float('-inf') 表示不適合
@@ -72,7 +117,7 @@ class PlaceScoring:
         efficiency_score = self._calculate_efficiency_score(place, travel_time)
         time_slot_score = self._calculate_time_slot_score(place, current_time)
         distance_score = self._calculate_distance_score(
-            place, current_location)
+            place, current_location, distance)
 
         # 計算加權平均
         weighted_score = (
@@ -84,6 +129,96 @@ class PlaceScoring:
 
         return self._normalize_score(weighted_score)
 
+    def calculate_scores(self,
+                         places: List[PlaceDetail],
+                         current_location: PlaceDetail,
+                         current_time: datetime,
+                         travel_times: np.ndarray,
+                         place_arrays: PlaceArrays,
+                         indices: np.ndarray,
+                         distances: Optional[np.ndarray] = None) -> np.ndarray:
+        """一次計算多個地點的綜合評分
+
+        與逐一呼叫 calculate_score 的結果相同，
+        各維度的分數以 NumPy 陣列運算一次算完所有候選地點
+
+        參數：
+            places: 要評分的地點
+            current_location: 當前位置
+            current_time: 當前時間
+            travel_times: 各地點的預估交通時間（分鐘）
+            place_arrays: 地點的欄位式資料
+            indices: 各地點在 place_arrays 中的索引
+            distances: 已算好的各地點直線距離（公里），未提供時才即時計算
+
+        回傳：
+            np.ndarray: 各地點 0-1 之間的評分，不適合的地點為 -inf
+        """
+        n = len(places)
+        weekday = current_time.isoweekday()
+        minutes = current_time.hour * 60 + current_time.minute
+        durations = place_arrays.duration[indices].astype(np.float64)
+
+        # 評分與類型直接讀取地點屬性，保留原始精度
+        ratings = np.fromiter(
+            (place.rating for place in places), dtype=np.float64, count=n)
+        labels = [place.label for place in places]
+        is_sight = np.fromiter(
+            (label in _SIGHT_LABELS for label in labels), dtype=bool, count=n)
+        is_meal = np.fromiter(
+            (label in _MEAL_LABELS for label in labels), dtype=bool, count=n)
+
+        # 基礎評分：0-5 分轉為 0-1 分，4.5 分以上額外加分，無評分給予中等分數
+        rating_score = np.minimum(1.0, ratings / _MAX_RATING)
+        rating_score = np.where(
+            ratings >= _RATING_BONUS_THRESHOLD,
+            np.minimum(1.0, rating_score +
+                       (ratings - _RATING_BONUS_THRESHOLD) * _RATING_BONUS_RATE),
+            rating_score)
+        rating_score[ratings == 0] = _NO_RATING_SCORE
+
+        # 時間效率：依地點類型調整期望效率，就在當前位置時給予最高分
+        expected_ratio = np.where(
+            is_sight, self.efficiency_base * _SIGHT_EFFICIENCY_FACTOR,
+            np.where(is_meal, self.efficiency_base * _MEAL_EFFICIENCY_FACTOR,
+                     self.efficiency_base))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            efficiency_score = np.clip(
+                durations / travel_times / expected_ratio, 0.0, 1.0)
+        efficiency_score[travel_times <= 0] = 1.0
+
+        # 時段適合度
+        current_code = PERIOD_CODES[self.time_service.get_time_period(current_time)]
+        base_score = _PERIOD_BASE_TABLE[
+            current_code, place_arrays.period[indices].astype(np.intp)]
+        is_open = place_arrays.is_open_batch(indices, weekday, minutes)
+        hours_score = np.where(
+            is_open,
+            self._evaluate_business_hours_fit_batch(
+                place_arrays.hours[indices, weekday - 1], minutes, durations),
+            0.0)
+        time_slot_score = np.minimum(1.0, base_score * hours_score)
+
+        # 距離合理性：沒有已算好的距離時，與 calculate_distance 相同取到小數點後一位
+        if distances is None:
+            lat, lon = DistanceMatrix.coordinates(places)
+            distances = np.round(DistanceMatrix.haversine(
+                current_location.lat, current_location.lon, lat, lon), 1)
+        max_distance = np.where(
+            is_sight, _MAX_DISTANCE * _SIGHT_DISTANCE_FACTOR,
+            np.where(is_meal, _MAX_DISTANCE * _MEAL_DISTANCE_FACTOR, _MAX_DISTANCE))
+        distance_score = np.clip(1.0 - distances / max_distance, 0.0, 1.0)
+
+        weighted_score = (
+            rating_score * self.weights.rating_weight +
+            efficiency_score * self.weights.efficiency_weight +
+            time_slot_score * self.weights.time_slot_weight +
+            distance_score * self.weights.distance_weight
+        )
+        scores = np.clip(weighted_score, self.min_score, self.max_score)
+        scores[~is_open] = float('-inf')
+        return scores
+
     def _calculate_rating_score(self, place: PlaceDetail) -> float:
         """計算基礎評分分數
 
@@ -100,14 +235,15 @@ class PlaceScoring:
             float: 0-1 之間的標準化評分
         """
         if not place.rating:
-            return 0.5  # 無評分時給予中等分數
+            return _NO_RATING_SCORE  # 無評分時給予中等分數
 
         # 基本分數：將 0-5 分轉換為 0-1 分
-        base_score = min(1.0, place.rating / 5.0)
+        base_score = min(1.0, place.rating / _MAX_RATING)
 
         # 高評分獎勵機制（4.5分以上的地點）
-        if place.rating >= 4.5:
-            bonus = (place.rating - 4.5) * 0.1  # 最多加 0.05 分
+        if place.rating >= _RATING_BONUS_THRESHOLD:
+            # 最多加 0.05 分
+            bonus = (place.rating - _RATING_BONUS_THRESHOLD) * _RATING_BONUS_RATE
             return min(1.0, base_score + bonus)
 
         return base_score
@@ -135,16 +271,19 @@ class PlaceScoring:
 
         # 根據地點類型調整期望效率
         expected_ratio = self.efficiency_base
-        if place.label in ['景點', '主要景點']:
-            expected_ratio *= 0.8  # 景點可以接受較低的效率
-        elif place.label in ['餐廳', '小吃']:
-            expected_ratio *= 1.2  # 用餐地點要求較高效率
+        if place.label in _SIGHT_LABELS:
+            expected_ratio *= _SIGHT_EFFICIENCY_FACTOR  # 景點可以接受較低的效率
+        elif place.label in _MEAL_LABELS:
+            expected_ratio *= _MEAL_EFFICIENCY_FACTOR  # 用餐地點要求較高效率
 
         # 標準化評分
         score = min(1.0, efficiency_ratio / expected_ratio)
         return max(0.0, score)
 
-    def _calculate_distance_score(self, place: PlaceDetail, current_location: PlaceDetail) -> float:
+    def _calculate_distance_score(self,
+                                  place: PlaceDetail,
+                                  current_location: PlaceDetail,
+                                  distance: Optional[float] = None) -> float:
         """計算距離合理性分數
 
         這個方法評估地點與當前位置的距離是否合理。它會：
@@ -155,22 +294,24 @@ class PlaceScoring:
         參數:
             place: 要評分的地點
             current_location: 當前位置
+            distance: 已算好的直線距離（公里），未提供時才即時計算
 
         回傳:
             float: 0-1 之間的距離分數，越近分數越高
         """
-        # 計算實際距離
-        distance = self.geo_service.calculate_distance(
-            {'lat': current_location.lat, 'lon': current_location.lon},
-            {'lat': place.lat, 'lon': place.lon}
-        )
+        # 計算實際距離，篩選候選地點時已算過的距離直接沿用
+        if distance is None:
+            distance = self.geo_service.calculate_distance(
+                {'lat': current_location.lat, 'lon': current_location.lon},
+                {'lat': place.lat, 'lon': place.lon}
+            )
 
         # 根據地點類型調整可接受距離
-        max_distance = 30.0  # 預設最大可接受距離（公里）
-        if place.label in ['景點', '主要景點']:
-            max_distance *= 1.2  # 景點可以接受較遠的距離
-        elif place.label in ['餐廳', '小吃']:
-            max_distance *= 0.8  # 餐飲地點要求較近
+        max_distance = _MAX_DISTANCE  # 預設最大可接受距離（公里）
+        if place.label in _SIGHT_LABELS:
+            max_distance *= _SIGHT_DISTANCE_FACTOR  # 景點可以接受較遠的距離
+        elif place.label in _MEAL_LABELS:
+            max_distance *= _MEAL_DISTANCE_FACTOR  # 餐飲地點要求較近
 
         # 計算距離分數（線性遞減）
         score = 1.0 - (distance / max_distance)
@@ -194,17 +335,8 @@ class PlaceScoring:
         # 取得當前時段
         current_period = self.time_service.get_time_period(current_time)
 
-        # 基本分數：是否在建議時段
-        if current_period == place.period:
-            base_score = 1.0
-        else:
-            # 不在建議時段，根據時段差距給予部分分數
-            periods = ['morning', 'lunch', 'afternoon', 'dinner', 'night']
-            current_idx = periods.index(current_period)
-            place_idx = periods.index(place.period)
-            period_diff = abs(current_idx - place_idx)
-
-            base_score = max(0.3, 1.0 - (period_diff * 0.2))
+        # 基本分數：在建議時段為 1，否則依時段差距查表給予部分分數
+        base_score = _PERIOD_BASE_SCORES[current_period, place.period]
 
         # 考慮營業時間的影響
         hours_score = self._evaluate_business_hours_fit(place, current_time)
@@ -224,10 +356,10 @@ class PlaceScoring:
             bool: True 表示營業中，False 表示不營業
         """
         weekday = current_time.isoweekday()  # 1-7 代表週一到週日
-        time_str = current_time.strftime(self.time_service.TIME_FORMAT)
+        minutes = current_time.hour * 60 + current_time.minute
 
-        # 使用地點的 is_open_at 方法檢查營業狀態
-        return place.is_open_at(weekday, time_str)
+        # 使用地點的營業時間檢查，直接傳入分鐘數
+        return place.is_open_at_minutes(weekday, minutes)
 
     def _evaluate_business_hours_fit(self, place: PlaceDetail, current_time: datetime) -> float:
         """評估營業時間的適合度
@@ -245,53 +377,79 @@ class PlaceScoring:
             float: 0-1 之間的適合度分數
         """
         weekday = current_time.isoweekday()
-        time_str = current_time.strftime(self.time_service.TIME_FORMAT)
+        minutes = current_time.hour * 60 + current_time.minute
 
         # 先檢查是否營業
-        is_open = place.is_open_at(weekday, time_str)
+        is_open = place.is_open_at_minutes(weekday, minutes)
         if not is_open:
             return 0.0
 
-        # 檢查剩餘營業時間
-        slots = place.hours.get(weekday, [])
+        # 檢查剩餘營業時間，使用建立地點時已轉換好的分鐘數
         best_score = 0.0  # 取多個時段中的最佳分數
 
-        for slot in slots:
-            if slot is None:
-                continue
-
+        for start, end in place.hours_min.get(weekday, []):
             current_slot_score = self._calculate_slot_score(
-                current_time,
-                slot,
+                minutes,
+                start,
+                end,
                 place.duration_min
             )
             best_score = max(best_score, current_slot_score)
 
         return best_score
 
+    @staticmethod
+    def _evaluate_business_hours_fit_batch(slots: np.ndarray,
+                                           current_minutes: int,
+                                           durations: np.ndarray) -> np.ndarray:
+        """一次評估多個地點當天所有營業時段的適合度
+
+        與 _calculate_slot_score 相同的規則，取每個地點各時段中的最佳分數
+
+        參數:
+            slots: 當天的營業時段，形狀為 (N, K, 2)，-1 表示無營業時段
+            current_minutes: 當前時間（當天的分鐘數）
+            durations: 各地點的預計停留時間
+
+        回傳:
+            np.ndarray: 各地點 0-1 之間的分數（未檢查是否營業）
+        """
+        starts = slots[..., 0].astype(np.int32)
+        closing = slots[..., 1].astype(np.int32)
+
+        # 跨日營業調整結束時間，剩餘時間為負時再加一天
+        closing = np.where(closing < starts, closing + 24 * 60, closing)
+        remaining = closing - current_minutes
+        remaining = np.where(remaining < 0, remaining + 24 * 60, remaining)
+
+        duration = durations[:, None]
+        slot_scores = np.where(
+            remaining < duration, 0.0,
+            np.where(remaining < duration * _SLOT_TIGHT_FACTOR, _SLOT_TIGHT_SCORE, 1.0))
+        slot_scores[starts < 0] = 0.0
+
+        if slot_scores.shape[1] == 0:
+            return np.zeros(len(durations))
+        return slot_scores.max(axis=1)
+
     def _calculate_slot_score(self,
-                              current_time: datetime,
-                              slot: Dict[str, str],
+                              current_minutes: int,
+                              start_minutes: int,
+                              closing_minutes: int,
                               duration_min: int) -> float:
         """計算單一時段的適合度分數
 
         參數:
-            current_time: 當前時間
-            slot: 營業時段資訊
+            current_minutes: 當前時間（當天的分鐘數）
+            start_minutes: 營業時段開始（當天的分鐘數）
+            closing_minutes: 營業時段結束（當天的分鐘數）
             duration_min: 預計停留時間
 
         回傳:
             float: 0-1 之間的分數
         """
-        # 解析結束時間
-        closing_time = datetime.strptime(slot['end'],
-                                         self.time_service.TIME_FORMAT).time()
-        current_minutes = current_time.hour * 60 + current_time.minute
-        closing_minutes = closing_time.hour * 60 + closing_time.minute
-
         # 如果是跨日營業，調整結束時間
-        if closing_time < datetime.strptime(slot['start'],
-                                            self.time_service.TIME_FORMAT).time():
+        if closing_minutes < start_minutes:
             closing_minutes += 24 * 60
 
         # 計算剩餘時間
@@ -302,8 +460,8 @@ class PlaceScoring:
         # 根據剩餘時間評分
         if remaining_minutes < duration_min:
             return 0.0  # 剩餘時間不足
-        elif remaining_minutes < duration_min * 1.5:
-            return 0.5  # 時間稍嫌緊湊
+        elif remaining_minutes < duration_min * _SLOT_TIGHT_FACTOR:
+            return _SLOT_TIGHT_SCORE  # 時間稍嫌緊湊
         else:
             return 1.0  # 有充足時間
 
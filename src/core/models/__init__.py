@@ -1,11 +1,13 @@
 # src/core/models/__init__.py
 
 from .place import PlaceDetail
+from .place_arrays import PlaceArrays
 from .time import TimeSlot
 from .trip import TripPlan, TripRequirement, Transport
 
 __all__ = [
     'PlaceDetail',
+    'PlaceArrays',
     'TimeSlot',
     'TripPlan',
     'TripRequirement',
@@ -1,9 +1,10 @@
 # src/core/models/place.py
 
-from typing import List, Dict, Optional, Union
-from pydantic import BaseModel, Field, field_validator
+from typing import List, Dict, Optional, Tuple, Union
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, field_validator, model_validator
 from datetime import datetime
 
+from ..services.geo_service import GeoService
 from ..services.time_service import TimeService
 from ..utils.validator import TripValidator
 
@@ -16,8 +17,12 @@ class PlaceDetail(BaseModel):
     2. 時間管理(營業時間、建議停留時間)
     3. 分類標籤
     4. 時段標記
+
+    建立後即不可修改（frozen），規劃過程中可以安全地共用同一個物件
     """
 
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(
         description="地點名稱",
         examples=["台北101", "故宮博物院"]
@@ -47,7 +52,7 @@ class PlaceDetail(BaseModel):
 
     duration: Optional[int] = Field(
         ge=0,                # 不可為負數
-        default=None,        # 先設為 None,讓 __init__ 處理預設值
+        default=None,        # 先設為 None,讓 fill_duration 處理預設值
         description="建議停留時間(分鐘)",
         examples=[90, 120]
     )
@@ -79,22 +84,86 @@ class PlaceDetail(BaseModel):
         """
     )
 
-    def __init__(self, **data):
-        # 檢查是否有 duration 或 duration_min
-        if 'duration' not in data and 'duration_min' in data:
-            data['duration'] = data['duration_min']
+    # 預先轉換為分鐘數的營業時間，避免重複解析時間字串
+    _hours_min: Dict[int, List[Tuple[int, int]]] = PrivateAttr(
+        default_factory=dict)
+
+    @model_validator(mode='before')
+    @classmethod
+    def fill_duration(cls, data):
+        """統一 duration 與 duration_min 兩種欄位名稱
+
+        在驗證前處理，PlaceDetail(**loc) 與 PlaceDetail.model_validate(loc)
+        都會套用，且只修改複本，不會改動呼叫端傳入的字典
+        """
+        if not isinstance(data, dict):
+            return data
+
+        duration = data.get('duration')
+        duration_min = data.get('duration_min')
+
+        # 兩個欄位已經一致（例如 model_dump 的結果）時不必複製
+        if duration is not None and duration == duration_min:
+            return data
+
+        if duration is None:
+            duration = duration_min
 
         # 如果都沒有,根據 label 設定預設值
-        if 'duration' not in data or data['duration'] is None:
+        if duration is None:
             if 'label' in data:
-                data['duration'] = self._get_default_duration(data['label'])
+                duration = cls._get_default_duration(data['label'])
             else:
-                data['duration'] = 60  # 最終預設值
+                duration = 60  # 最終預設值
 
         # 為了相容性,確保 duration_min 也有值
-        data['duration_min'] = data['duration']
+        return {**data, 'duration': duration, 'duration_min': duration}
 
-        super().__init__(**data)
+    def model_post_init(self, __context) -> None:
+        """建立分鐘數格式的營業時間
+
+        建立物件時一次把 "HH:MM" 字串轉換為當天的分鐘數，
+        之後的營業時間檢查只需要整數比較
+        """
+        self._hours_min = {
+            day: [
+                (TimeService.to_minutes(slot['start']),
+                 TimeService.to_minutes(slot['end']))
+                for slot in (slots or []) if slot is not None
+            ]
+            for day, slots in self.hours.items()
+        }
+
+    @classmethod
+    def bulk_from(cls, items: List[Union[Dict, 'PlaceDetail']]) -> List['PlaceDetail']:
+        """一次轉換整批地點資料
+
+        整個列表交給 pydantic 一次驗證，不必逐筆以 cls(**item) 展開關鍵字參數；
+        已經是 PlaceDetail 的元素直接沿用，不會重新驗證
+
+        輸入參數:
+            items: 地點字典或 PlaceDetail 的列表
+
+        回傳:
+            List[PlaceDetail]: 地點物件列表
+
+        使用範例:
+            >>> places = PlaceDetail.bulk_from(DEFAULT_LOCATIONS)
+        """
+        if items and all(isinstance(item, cls) for item in items):
+            return list(items)
+        return _PLACE_LIST_ADAPTER.validate_python(items)
+
+    @property
+    def hours_min(self) -> Dict[int, List[Tuple[int, int]]]:
+        """分鐘數格式的營業時間
+
+        格式：
+            {1: [(540, 1020)], 2: [], ...}
+            - 每個時段為 (開始分鐘數, 結束分鐘數)
+            - 店休的日子為空列表
+        """
+        return self._hours_min
 
     @staticmethod
     def _get_default_duration(label: str) -> int:
@@ -125,20 +194,15 @@ class PlaceDetail(BaseModel):
     @field_validator('period')
     def validate_period(cls, v: str) -> str:
         """驗證時段標記的正確性"""
-        valid_periods = {'morning', 'lunch', 'afternoon', 'dinner', 'night'}
-        if v not in valid_periods:
+        if v not in TripValidator.VALID_PERIODS:
             raise ValueError(f'無效的時段標記: {v}')
         return v
 
     @field_validator('hours')
     def validate_hours(cls, v: Dict) -> Dict:
         """驗證營業時間格式"""
-        try:
-            # 使用新的驗證器
-            TripValidator.validate_business_hours(v)
-            return v
-        except ValueError as e:
-            raise ValueError(f"營業時間格式錯誤: {str(e)}")
+        TripValidator.validate_business_hours(v)
+        return v
 
     @field_validator('lat', 'lon')
     def validate_coordinates(cls, v: float, field: str) -> float:
@@ -170,8 +234,6 @@ class PlaceDetail(BaseModel):
             >>> point = {'lat': 25.0, 'lon': 121.5}
             >>> distance = place1.calculate_distance(point)
         """
-        from src.core.services.geo_service import GeoService
-
         # 將自己的座標轉換為字典格式
         self_dict = {
             'lat': float(self.lat),  # 確保是浮點數
@@ -200,23 +262,25 @@ class PlaceDetail(BaseModel):
             day: 1-7 代表週一到週日
             time_str: "HH:MM" 格式時間
         """
-        if day not in self.hours:
-            return False
+        return self.is_open_at_minutes(day, TimeService.to_minutes(time_str))
 
-        time_slots = self.hours[day]
-        if not time_slots or time_slots[0] is None:
-            return False
+    def is_open_at_minutes(self, day: int, check_minutes: int) -> bool:
+        """檢查指定時間是否在營業時間內（以當天分鐘數表示）
 
-        check_time = datetime.strptime(
-            time_str, TimeService.TIME_FORMAT).time()
+        規劃迴圈中已經有分鐘數時使用，不必先格式化成字串再解析
 
-        for slot in time_slots:
-            if slot is None:
-                continue
-
-            start, end = TimeService.parse_time_range(
-                slot['start'], slot['end'])
-            if TimeService.is_time_in_range(check_time, start, end, allow_overnight=True):
+        輸入:
+            day: 1-7 代表週一到週日
+            check_minutes: 從午夜起算的分鐘數
+        """
+        # 直接讀取建立時已解析好的分鐘數，
+        # 沒有設定或店休的日子在 _hours_min 中不存在或為空列表
+        for start, end in self._hours_min.get(day, ()):
+            if end < start:
+                # 跨日營業 (例如 22:00-03:00)
+                if check_minutes >= start or check_minutes <= end:
+                    return True
+            elif start <= check_minutes <= end:
                 return True
 
         return False
@@ -237,8 +301,6 @@ class PlaceDetail(BaseModel):
         回傳:
             bool: True 表示適合，False 表示不適合
         """
-        from src.core.services.time_service import TimeService
-
         time_service = TimeService(
             lunch_time="12:00",   # 預設午餐時間
             dinner_time="18:00"   # 預設晚餐時間
@@ -264,8 +326,7 @@ class PlaceDetail(BaseModel):
                 'end': str
             }
         """
-        current = datetime.strptime(
-            current_time, TimeService.TIME_FORMAT).time()
+        current = TimeService.to_minutes(current_time)
 
         for day_offset in range(7):
             check_day = ((current_day - 1 + day_offset) % 7) + 1
@@ -278,8 +339,7 @@ class PlaceDetail(BaseModel):
                 if slot is None:
                     continue
 
-                start_time = datetime.strptime(slot['start'],
-                                               TimeService.TIME_FORMAT).time()
+                start_time = TimeService.to_minutes(slot['start'])
 
                 if day_offset == 0 and start_time <= current:
                     continue
@@ -291,3 +351,7 @@ class PlaceDetail(BaseModel):
                 }
 
         return None
+
+
+# 整批驗證地點列表用的轉換器，見 PlaceDetail.bulk_from
+_PLACE_LIST_ADAPTER = TypeAdapter(List[PlaceDetail])
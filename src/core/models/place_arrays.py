@@ -0,0 +1,222 @@
+# src/core/models/place_arrays.py
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from .place import PlaceDetail
+from ..services.time_service import TimeService
+
+
+# 時段名稱對應的整數代碼
+PERIOD_CODES = {period: i for i, period in enumerate(TimeService.PERIODS)}
+
+
+@dataclass
+class PlaceArrays:
+    """地點資料的欄位式（SoA）表示
+
+    將 PlaceDetail 列表中規劃會用到的欄位攤平成 NumPy 陣列，
+    讓規劃器可以用向量化運算一次篩選所有地點，
+    不必逐一存取每個物件的屬性。
+
+    屬性：
+        places: 原始的 PlaceDetail 列表，索引與各陣列一致
+        lat, lon: 緯度、經度 (float32)
+        duration: 停留時間，分鐘 (int16)
+        rating: 評分 (float32)
+        period: 時段代碼，對應 PERIOD_CODES (int8)
+        hours: 營業時間，形狀為 (N, 7, K, 2)，
+               儲存每天每個時段的開始/結束分鐘數，-1 表示無營業時段
+        open_starts, open_ends: 營業區間索引，形狀為 (N, 7, M)，
+               跨日時段拆成「開始到午夜」與「午夜到結束」兩段，
+               查詢營業狀態時只需要整數比較
+
+    行程日期固定時，規劃過程只會用到其中一天的營業區間，
+    for_day() 會把該天的區間取出成連續陣列並快取。
+    """
+
+    places: List[PlaceDetail]
+    lat: np.ndarray
+    lon: np.ndarray
+    duration: np.ndarray
+    rating: np.ndarray
+    period: np.ndarray
+    hours: np.ndarray
+    open_starts: np.ndarray
+    open_ends: np.ndarray
+    _index: Dict[int, int] = field(default_factory=dict, repr=False)
+    _day_cache: Dict[int, Tuple[np.ndarray, np.ndarray]] = field(
+        default_factory=dict, repr=False)
+
+    @classmethod
+    def from_places(cls, places: List[PlaceDetail]) -> 'PlaceArrays':
+        """由 PlaceDetail 列表建立欄位式陣列
+
+        輸入參數:
+            places: 已驗證的地點列表
+
+        回傳:
+            PlaceArrays: 欄位式的地點資料
+        """
+        n = len(places)
+
+        # hours_min 每個地點只讀取一次，後續建立兩種營業時間陣列共用
+        hours_by_place = [place.hours_min for place in places]
+
+        # 每天最多的營業時段數
+        max_slots = max(
+            (len(slots) for hours_min in hours_by_place
+             for slots in hours_min.values()),
+            default=1
+        )
+
+        positions = []
+        minutes = []
+        for i, hours_min in enumerate(hours_by_place):
+            for day, slots in hours_min.items():
+                for k, slot in enumerate(slots):
+                    positions.append((i, day - 1, k))
+                    minutes.append(slot)
+        hours = cls._scatter((n, 7, max_slots, 2), positions, minutes)
+
+        open_starts, open_ends = cls._build_open_intervals(hours_by_place)
+
+        def column(values, dtype) -> np.ndarray:
+            # 直接寫入預先配置好大小的陣列，不建立中間的 Python 列表
+            return np.fromiter(values, dtype=dtype, count=n)
+
+        return cls(
+            places=list(places),
+            lat=column((p.lat for p in places), np.float32),
+            lon=column((p.lon for p in places), np.float32),
+            duration=column((p.duration_min for p in places), np.int16),
+            rating=column((p.rating for p in places), np.float32),
+            period=column((PERIOD_CODES[p.period] for p in places), np.int8),
+            hours=hours,
+            open_starts=open_starts,
+            open_ends=open_ends,
+            _index={id(place): i for i, place in enumerate(places)}
+        )
+
+    @staticmethod
+    def _scatter(shape: Tuple[int, ...],
+                 positions: List[Tuple[int, int, int]],
+                 values: list) -> np.ndarray:
+        """建立以 -1 填滿的 int16 陣列，並一次寫入指定位置的值
+
+        先收集所有位置再以一次花式索引寫入，
+        不逐一對 NumPy 陣列做元素指派
+
+        輸入參數:
+            shape: 陣列形狀
+            positions: 要寫入的 (地點, 星期, 時段) 索引
+            values: 對應位置的值
+
+        回傳:
+            np.ndarray: 填好的陣列
+        """
+        array = np.full(shape, -1, dtype=np.int16)
+        if positions:
+            array[tuple(np.array(positions, dtype=np.intp).T)] = values
+        return array
+
+    @classmethod
+    def _build_open_intervals(cls,
+                              hours_by_place: List[Dict[int, List[Tuple[int, int]]]]
+                              ) -> Tuple[np.ndarray, np.ndarray]:
+        """建立營業區間索引
+
+        將每天的營業時段依開始時間排序，跨日時段拆成兩段，
+        空位以 -1 填補（-1 的區間不會包含任何時間）
+
+        輸入參數:
+            hours_by_place: 每個地點分鐘數格式的營業時間
+
+        回傳:
+            Tuple[np.ndarray, np.ndarray]: (開始分鐘數, 結束分鐘數)，形狀皆為 (N, 7, M)
+        """
+        positions = []
+        starts = []
+        ends = []
+        max_intervals = 1
+        for i, hours_min in enumerate(hours_by_place):
+            days = [[] for _ in range(7)]
+            for day, slots in hours_min.items():
+                for start, end in slots:
+                    if end < start:
+                        days[day - 1].append((start, 24 * 60 - 1))
+                        days[day - 1].append((0, end))
+                    else:
+                        days[day - 1].append((start, end))
+            for d, day_slots in enumerate(days):
+                day_slots.sort()
+                max_intervals = max(max_intervals, len(day_slots))
+                for k, (start, end) in enumerate(day_slots):
+                    positions.append((i, d, k))
+                    starts.append(start)
+                    ends.append(end)
+
+        shape = (len(hours_by_place), 7, max_intervals)
+        return (cls._scatter(shape, positions, starts),
+                cls._scatter(shape, positions, ends))
+
+    def is_open_batch(self,
+                      indices: np.ndarray,
+                      day: int,
+                      minutes: int) -> np.ndarray:
+        """一次檢查多個地點在指定時間是否營業
+
+        輸入參數:
+            indices: 要檢查的地點索引
+            day: 1-7 代表週一到週日
+            minutes: 當天的分鐘數
+
+        回傳:
+            np.ndarray: 布林陣列，True 表示營業中
+
+        使用範例:
+            >>> arrays.is_open_batch(np.arange(len(arrays)), 1, 600)
+        """
+        starts, ends = self.for_day(day)
+        starts = starts[indices]
+        ends = ends[indices]
+        return ((starts <= minutes) & (minutes <= ends)).any(axis=-1)
+
+    def for_day(self, day: int) -> Tuple[np.ndarray, np.ndarray]:
+        """取得指定星期的營業區間
+
+        輸入參數:
+            day: 1-7 代表週一到週日
+
+        回傳:
+            Tuple[np.ndarray, np.ndarray]: (開始分鐘數, 結束分鐘數)，形狀皆為 (N, M)
+        """
+        if day not in self._day_cache:
+            self._day_cache[day] = (
+                np.ascontiguousarray(self.open_starts[:, day - 1]),
+                np.ascontiguousarray(self.open_ends[:, day - 1])
+            )
+        return self._day_cache[day]
+
+    def index_of(self, place: PlaceDetail) -> Optional[int]:
+        """取得地點在陣列中的索引，不存在則回傳 None"""
+        return self._index.get(id(place))
+
+    def indices_of(self, places: List[PlaceDetail]) -> Optional[np.ndarray]:
+        """一次取得多個地點在陣列中的索引
+
+        輸入參數:
+            places: 地點列表
+
+        回傳:
+            Optional[np.ndarray]: 索引陣列，任一地點不存在則回傳 None
+        """
+        index = self._index
+        indices = [index.get(id(place)) for place in places]
+        if None in indices:
+            return None
+        return np.array(indices, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.places)
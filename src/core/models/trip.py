@@ -1,10 +1,10 @@
 # src/core/models/trip.py
 
-from datetime import datetime, timedelta
 from typing import List, Union, Literal
 from pydantic import BaseModel, Field, field_validator
 import re
 from .time import TimeSlot
+from ..services.time_service import TimeService
 from ..utils.validator import TripValidator  # 更新引用
 
 
@@ -20,11 +20,8 @@ class Transport(BaseModel):
     @classmethod
     def validate_mode(cls, v: str) -> str:
         """驗證交通方式"""
-        try:
-            TripValidator.validate_transport_mode(v)
-            return v
-        except ValueError as e:
-            raise ValueError(str(e))
+        TripValidator.validate_transport_mode(v)
+        return v
 
 
 class TripPlan(BaseModel):
@@ -81,21 +78,18 @@ class TripRequirement(BaseModel):
     @classmethod
     def validate_transport(cls, v: str) -> str:
         """驗證交通方式"""
-        try:
-            TripValidator.validate_transport_mode(v)
-            return v
-        except ValueError as e:
-            raise ValueError(str(e))
+        TripValidator.validate_transport_mode(v)
+        return v
 
     def get_meal_times(self) -> List[TimeSlot]:
         """取得所有設定的用餐時間"""
         meal_times = []
         for meal_time in [self.breakfast_time, self.lunch_time, self.dinner_time]:
             if meal_time != "none":
-                start_time = datetime.strptime(meal_time, '%H:%M')
-                end_time = start_time + timedelta(hours=1)
+                # 時間格式已由欄位驗證確認，直接以分鐘數計算，不經過 strptime
+                end_minutes = (TimeService.to_minutes(meal_time) + 60) % 1440
                 meal_times.append(TimeSlot(
-                    start_time=start_time.strftime('%H:%M'),
-                    end_time=end_time.strftime('%H:%M')
+                    start_time=meal_time,
+                    end_time=TimeService.format_minutes(end_minutes)
                 ))
         return meal_times
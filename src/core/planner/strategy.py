@@ -3,11 +3,14 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 import random
+import sys
+import numpy as np
 from typing import List, Dict, Optional, Tuple
 from ..models.place import PlaceDetail
 from ..services.time_service import TimeService
 from ..services.geo_service import GeoService
 from ..evaluator.place_scoring import PlaceScoring
+from ..utils.distance_matrix import DistanceMatrix
 
 
 class BasePlanningStrategy:
@@ -20,6 +23,14 @@ class BasePlanningStrategy:
     4. 追蹤規劃進度
     """
 
+    # 交通方式中英對照
+    TRANSPORT_DISPLAY = {
+        'transit': '大眾運輸',
+        'driving': '開車',
+        'walking': '步行',
+        'bicycling': '騎車'
+    }
+
     def __init__(self,
                  time_service: TimeService,
                  geo_service: GeoService,
@@ -36,6 +47,8 @@ class BasePlanningStrategy:
                 - end_time: datetime 結束時間
                 - travel_mode: str 交通方式
                 - distance_threshold: float 最大可接受距離(公里)
+                - distance_matrix: DistanceMatrix 預先計算的距離矩陣(選填)
+                - place_arrays: PlaceArrays 欄位式的地點資料(選填)
         """
         # 基礎服務元件
         self.time_service = time_service
@@ -48,6 +61,8 @@ class BasePlanningStrategy:
         self.travel_mode = config['travel_mode']
         self.distance_threshold = config.get('distance_threshold', 30)
         self.end_location = config.get('end_location')
+        self.distance_matrix = config.get('distance_matrix')
+        self.place_arrays = config.get('place_arrays')
 
         # 時段管理
         self.period_sequence = ['morning', 'lunch',
@@ -60,6 +75,9 @@ class BasePlanningStrategy:
         self._itinerary = []  # 儲存規劃的行程
         self.total_distance = 0.0  # 總行程距離
 
+        # 規劃中的候選列表及其依時段分組的結果，見 _get_period_candidates
+        self._period_groups = None
+
         # 用餐狀態
         self.lunch_completed = False
         self.dinner_completed = False
@@ -74,51 +92,70 @@ class BasePlanningStrategy:
 
         # 2. 篩選符合時段的地點
         suitable_places = [
-            place for place in available_places
-            if place.period == current_period and place.name not in self.visited_places
+            place for place in self._get_period_candidates(
+                available_places, current_period)
+            if place.name not in self.visited_places
         ]
 
         if not suitable_places:
             print(f"沒有符合{current_period}時段的地點")
             return None
 
+        # 一次檢查目前是否營業，同時取得地點在欄位式資料中的索引
+        is_open, indices = self._get_open_mask(suitable_places, current_time)
+
+        if not is_open.any():
+            print(f"符合{current_period}時段的地點目前都未營業")
+            return None
+
         # 3. 計算直線距離並評分
-        scored_places = []
-        for place in suitable_places:
-            distance = self.geo_service.calculate_distance(
-                {'lat': current_location.lat, 'lon': current_location.lon},
-                {'lat': place.lat, 'lon': place.lon}
-            )
+        # 到結束時間為止剩餘的分鐘數，交通加停留超過的地點直接排除
+        remaining_minutes = (self.end_time - current_time).total_seconds() / 60
+        distances, travel_times = self._get_candidate_metrics(
+            current_location, suitable_places)
+        durations = self._get_candidate_durations(suitable_places, indices)
+
+        # 營業、距離與剩餘時間合併成一個遮罩，
+        # 超出距離上限的組合在矩陣中為 inf，比較後直接排除
+        reachable = (is_open &
+                     (distances <= self.distance_threshold) &
+                     (travel_times + durations <= remaining_minutes))
+
+        candidates = np.flatnonzero(reachable)
+        scores = self._score_candidates(
+            [suitable_places[i] for i in candidates],
+            None if indices is None else indices[candidates],
+            current_location,
+            current_time,
+            travel_times[candidates],
+            distances[candidates]
+        )
 
-            if distance <= self.distance_threshold:
-                # 使用預估交通時間計算評分
-                estimated_time = distance * 2  # 粗略估計，1公里約2分鐘
-                score = self.place_scoring.calculate_score(
-                    place=place,
-                    current_location=current_location,
-                    current_time=current_time,
-                    travel_time=estimated_time
-                )
-                if score > float('-inf'):
-                    scored_places.append((place, score))
-
-        if not scored_places:
-            print("沒有在可接受距離內的地點")
+        scored = np.flatnonzero(scores > float('-inf'))
+        if not scored.size:
+            print("沒有在可接受距離與剩餘時間內的地點")
             return None
 
         # 4. 取評分最高的前3-5個地點
-        top_places = sorted(
-            scored_places, key=lambda x: x[1], reverse=True)[:5]
+        # 先以線性時間的 partition 找出第5高的分數，只排序不低於它的地點
+        # （同分的也保留），穩定排序讓同分的地點維持原本順序
+        if scored.size > 5:
+            fifth = np.partition(scores[scored], -5)[-5]
+            scored = scored[scores[scored] >= fifth]
+        top = scored[np.argsort(-scores[scored], kind='stable')[:5]]
 
         # 5. 隨機選擇一個
-        selected_place, _ = random.choice(top_places[:max(3, len(top_places))])
+        selected = candidates[random.choice(top[:max(3, len(top))].tolist())]
+        selected_place = suitable_places[selected]
+        selected_distance = float(distances[selected])
 
-        # 6. 只對選中的地點取得路線資訊
+        # 6. 只對選中的地點取得路線資訊，沿用篩選時算好的直線距離
         travel_info = self.geo_service.get_route(
             origin={"lat": current_location.lat, "lon": current_location.lon},
             destination={"lat": selected_place.lat, "lon": selected_place.lon},
             mode=self.travel_mode,
-            departure_time=current_time
+            departure_time=current_time,
+            distance=selected_distance
         )
 
         # print(f"\n選中地點: {selected_place.name}")
@@ -129,6 +166,207 @@ class BasePlanningStrategy:
 
         return selected_place, travel_info
 
+    def _score_candidates(self,
+                          places: List[PlaceDetail],
+                          indices: Optional[np.ndarray],
+                          current_location: PlaceDetail,
+                          current_time: datetime,
+                          travel_times: np.ndarray,
+                          distances: np.ndarray) -> np.ndarray:
+        """計算所有候選地點的評分
+
+        有欄位式資料的索引時以向量化方式一次評分，否則逐一評分
+
+        輸入參數:
+            places: List[PlaceDetail] 候選地點
+            indices: Optional[np.ndarray] 候選地點在 PlaceArrays 中的索引
+            current_location: PlaceDetail 當前位置
+            current_time: datetime 當前時間
+            travel_times: np.ndarray 預估交通時間(分鐘)
+            distances: np.ndarray 篩選時已算好的直線距離(公里)，評分時直接沿用
+
+        回傳:
+            np.ndarray 各地點的評分，不適合的地點為 -inf
+        """
+        if indices is not None:
+            return self.place_scoring.calculate_scores(
+                places, current_location, current_time, travel_times,
+                self.place_arrays, indices, distances)
+
+        # 使用預估交通時間計算評分
+        return np.fromiter(
+            (self.place_scoring.calculate_score(
+                place=place,
+                current_location=current_location,
+                current_time=current_time,
+                travel_time=travel_time,
+                distance=distance
+            ) for place, travel_time, distance in zip(
+                places, travel_times.tolist(), distances.tolist())),
+            dtype=np.float64, count=len(places))
+
+    def _get_period_candidates(self,
+                               available_places: List[PlaceDetail],
+                               period: str) -> List[PlaceDetail]:
+        """取得指定時段的候選地點
+
+        execute 開始時會把候選列表依時段分組一次，
+        規劃迴圈中直接取用該時段的分組，不必每次掃過全部地點；
+        傳入其他列表時則即時篩選
+
+        輸入參數:
+            available_places: List[PlaceDetail] 候選地點
+            period: str 時段名稱
+
+        回傳:
+            List[PlaceDetail] 屬於該時段的地點（可能包含已造訪的地點）
+        """
+        if self._period_groups is not None:
+            places, groups = self._period_groups
+            if places is available_places:
+                return groups.get(period, [])
+
+        return [place for place in available_places if place.period == period]
+
+    def _get_open_mask(self,
+                       places: List[PlaceDetail],
+                       current_time: datetime
+                       ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """檢查候選地點在指定時間是否營業
+
+        使用 PlaceArrays 的營業區間索引一次檢查所有候選地點，
+        沒有欄位式資料時全部視為營業中，交由評分系統逐一檢查
+
+        輸入參數:
+            places: List[PlaceDetail] 候選地點
+            current_time: datetime 要檢查的時間
+
+        回傳:
+            Tuple[np.ndarray, Optional[np.ndarray]]
+                營業狀態的布林陣列，及地點在 PlaceArrays 中的索引（沒有欄位式資料時為 None）
+        """
+        indices = None
+        if self.place_arrays is not None and places:
+            indices = self.place_arrays.indices_of(places)
+
+        if indices is None:
+            return np.ones(len(places), dtype=bool), None
+
+        is_open = self.place_arrays.is_open_batch(
+            indices,
+            current_time.isoweekday(),
+            current_time.hour * 60 + current_time.minute
+        )
+        return is_open, indices
+
+    def _get_candidate_durations(self,
+                                 places: List[PlaceDetail],
+                                 indices: Optional[np.ndarray]) -> np.ndarray:
+        """取得候選地點的停留時間
+
+        有欄位式資料的索引時直接從陣列取出，不必逐一讀取物件屬性
+
+        輸入參數:
+            places: List[PlaceDetail] 候選地點
+            indices: Optional[np.ndarray] 候選地點在 PlaceArrays 中的索引
+
+        回傳:
+            np.ndarray 停留時間(分鐘)，float64
+        """
+        if indices is not None:
+            return self.place_arrays.duration[indices].astype(np.float64)
+
+        return np.fromiter(
+            (place.duration_min for place in places),
+            dtype=np.float64, count=len(places))
+
+    def _get_candidate_metrics(self,
+                               origin: PlaceDetail,
+                               places: List[PlaceDetail]) -> Tuple[np.ndarray, np.ndarray]:
+        """一次取得起點到所有候選地點的距離與預估交通時間
+
+        候選地點都在距離矩陣中時，直接取出矩陣的一列，
+        不必逐一查詢；否則退回逐點計算
+
+        輸入參數:
+            origin: PlaceDetail 起點
+            places: List[PlaceDetail] 候選地點
+
+        回傳:
+            Tuple[np.ndarray, np.ndarray] (距離(公里), 預估交通時間(分鐘))，皆為 float64
+        """
+        matrix = self.distance_matrix
+        if matrix is not None:
+            row = matrix.index_of(origin)
+            columns = matrix.indices_of(places)
+            if row is not None and columns is not None:
+                distances = matrix.distances[row, columns].astype(np.float64)
+                if matrix.travel_minutes is None:
+                    return distances, distances * 2
+                return distances, matrix.travel_minutes[row, columns].astype(np.float64)
+
+        # 逐點計算前先以邊界框排除一定超出距離上限的地點，
+        # 框外的地點不計算距離，直接記為 inf
+        distances = np.full(len(places), np.inf)
+        travel_times = np.full(len(places), np.inf)
+        lat, lon = DistanceMatrix.coordinates(places)
+        in_box = DistanceMatrix.bounding_box_row(
+            origin.lat, origin.lon, lat, lon, self.distance_threshold)
+
+        for i in np.flatnonzero(in_box).tolist():
+            place = places[i]
+            distance = self._get_distance(origin, place)
+            distances[i] = distance
+            travel_times[i] = self._get_estimated_travel_time(
+                origin, place, distance)
+        return distances, travel_times
+
+    def _get_distance(self, origin: PlaceDetail, destination: PlaceDetail) -> float:
+        """取得兩地點間的直線距離
+
+        優先查詢預先計算的距離矩陣，地點不在矩陣中時才即時計算
+
+        輸入參數:
+            origin: PlaceDetail 起點
+            destination: PlaceDetail 終點
+
+        回傳:
+            float 距離(公里)
+        """
+        if self.distance_matrix is not None:
+            distance = self.distance_matrix.distance(origin, destination)
+            if distance is not None:
+                return distance
+
+        return self.geo_service.calculate_distance(
+            {'lat': origin.lat, 'lon': origin.lon},
+            {'lat': destination.lat, 'lon': destination.lon}
+        )
+
+    def _get_estimated_travel_time(self,
+                                   origin: PlaceDetail,
+                                   destination: PlaceDetail,
+                                   distance: float) -> float:
+        """取得兩地點間的預估交通時間
+
+        優先查詢距離矩陣中依交通方式換算的時間，
+        沒有矩陣時以 1 公里約 2 分鐘粗略估計
+
+        輸入參數:
+            origin: PlaceDetail 起點
+            destination: PlaceDetail 終點
+            distance: float 兩點間距離(公里)
+
+        回傳:
+            float 預估交通時間(分鐘)
+        """
+        if self.distance_matrix is not None:
+            travel_time = self.distance_matrix.travel_time(origin, destination)
+            if travel_time is not None:
+                return travel_time
+
+        return distance * 2  # 粗略估計，1公里約2分鐘
+
     def execute(self,
                 current_location: PlaceDetail,
                 available_places: List[PlaceDetail],
@@ -184,19 +422,38 @@ class BasePlanningStrategy:
         print(f"\n=== 開始規劃行程 ===")
 
         # 初始化規劃狀態
-        remaining_places = available_places.copy()
+        # 候選列表在規劃中不會修改，直接使用傳入的列表；已選過的地點由
+        # visited_places 排除，另外記錄剩餘數量，不必每次以 list.remove 逐一比較地點模型
+        remaining_count = len(available_places)
+
+        # 依時段分組一次
+        groups = {}
+        for place in available_places:
+            groups.setdefault(place.period, []).append(place)
+        self._period_groups = (available_places, groups)
         current_loc = current_location
         visit_time = current_time
         iteration = 1
 
+        # 所有地點中最短的停留時間，剩餘時間不足時任何地點都排不進去。
+        # 只在開始時計算一次，包含之後才造訪的地點，所以是剩餘地點停留時間的下限，
+        # 提早結束的判斷不會排除任何還排得進去的地點
+        min_duration = min(
+            (place.duration_min for place in available_places), default=0)
+
         # 主要規劃迴圈
-        while remaining_places and visit_time < self.end_time:
+        while remaining_count and visit_time < self.end_time:
             # print(f"\n==== 選擇第 {iteration} 個地點 ====")
 
+            # 剩餘時間連最短的停留都不夠，不必再評分所有候選地點
+            if (self.end_time - visit_time).total_seconds() / 60 < min_duration:
+                print("找不到合適的下一個地點，結束規劃")
+                break
+
             # 選擇下一個地點
             next_place = self.select_next_place(
                 current_loc,
-                remaining_places,
+                available_places,
                 visit_time
             )
 
@@ -233,25 +490,33 @@ class BasePlanningStrategy:
             # 更新規劃狀態
             current_loc = place
             visit_time = departure_time
-            remaining_places.remove(place)
+            remaining_count -= 1
             self.visited_places.add(place.name)
             self.total_distance += travel_info['distance_km']
 
             iteration += 1
 
-        # 加入返回終點
-        if self._itinerary[-1]['name'] != self.end_location.name:  # 使用設定的終點
-            # 計算返回終點的路線
+        # 加入返回終點（最後一個行程項目就是 current_loc，直接讀物件屬性）
+        if current_loc.name != self.end_location.name:  # 使用設定的終點
+            # 計算返回終點的路線，終點在距離矩陣中時沿用矩陣的距離
+            # （超出距離上限記為 inf 的組合仍需即時計算）
+            final_distance = None
+            if self.distance_matrix is not None:
+                final_distance = self.distance_matrix.distance(
+                    current_loc, self.end_location)
+                if final_distance == float('inf'):
+                    final_distance = None
             final_travel_info = self.geo_service.get_route(
                 origin={
-                    "lat": float(self._itinerary[-1]['lat']),
-                    "lon": float(self._itinerary[-1]['lon'])
+                    "lat": float(current_loc.lat),
+                    "lon": float(current_loc.lon)
                 },
                 destination={
                     "lat": self.end_location.lat,  # 使用設定的終點
                     "lon": self.end_location.lon
                 },
-                mode=self.travel_mode
+                mode=self.travel_mode,
+                distance=final_distance
             )
 
             final_arrival_time = self._calculate_arrival_time(
@@ -269,9 +534,14 @@ class BasePlanningStrategy:
             self._itinerary.append(end_item)
             self.total_distance += final_travel_info['distance_km']
 
-        print(f"\n=== 行程規劃完成 ===")
-        print(f"規劃地點數: {len(self._itinerary)}")
-        print(f"總行程距離: {self.total_distance:.1f} 公里")
+        # 規劃摘要一次寫入標準輸出
+        sys.stdout.write(
+            f"\n=== 行程規劃完成 ===\n"
+            f"規劃地點數: {len(self._itinerary)}\n"
+            f"總行程距離: {self.total_distance:.1f} 公里\n"
+        )
+
+        self._period_groups = None
 
         return self._itinerary
 
@@ -332,6 +602,8 @@ class BasePlanningStrategy:
                 step: int - 在整個行程中的順序編號，從1開始計數
                 start_time: str - 到達時間，採用 "HH:MM" 格式 (例如 "09:30")
                 end_time: str - 離開時間，採用 "HH:MM" 格式
+                start_min: int - 到達時間，當天的分鐘數
+                end_min: int - 離開時間，當天的分鐘數
                 duration: int - 在該地點的停留時間，以分鐘為單位
                 travel_time: int - 到達該地點所需的交通時間，以分鐘為單位
                 travel_distance: float - 到達該地點的交通距離，以公里為單位
@@ -341,23 +613,22 @@ class BasePlanningStrategy:
 
         # 取得當天的營業時間
         weekday = arrival_time.isoweekday()  # 1-7
-        day_hours = place.hours.get(weekday, [])
+        day_hours = [slot for slot in place.hours.get(weekday, []) if slot]
+        arrival_min = arrival_time.hour * 60 + arrival_time.minute
+        departure_min = departure_time.hour * 60 + departure_time.minute
 
-        # 找出符合抵達時間的營業時段
+        # 找出符合抵達時間的營業時段（hours_min 與非空時段順序一致）
         matching_hours = None
-        for slot in day_hours:
-            if slot:
-                start = datetime.strptime(slot['start'], '%H:%M').time()
-                end = datetime.strptime(slot['end'], '%H:%M').time()
-                if start <= arrival_time.time() <= end:
-                    matching_hours = slot
-                    break
-
-        # 計算交通時段
-        travel_end = arrival_time
-        travel_start = travel_end - \
-            timedelta(minutes=travel_info.get('duration_minutes', 0))
-        travel_period = f"{travel_start.strftime('%H:%M')}-{travel_end.strftime('%H:%M')}"
+        for slot, (start, end) in zip(day_hours, place.hours_min.get(weekday, [])):
+            if start <= arrival_min <= end:
+                matching_hours = slot
+                break
+
+        # 計算交通時段（以當天分鐘數計算，跨過午夜時取餘數）
+        travel_start_min = (
+            arrival_min - int(travel_info.get('duration_minutes', 0))) % (24 * 60)
+        travel_period = (f"{TimeService.format_minutes(travel_start_min)}-"
+                         f"{TimeService.format_minutes(arrival_min)}")
         
         # 把起點終點的label替換
         if len(self.visited_places) == 0:
@@ -367,25 +638,23 @@ class BasePlanningStrategy:
         else:
             display_label = place.label
         
-        # 交通方式中英對照
-        transport_display = {
-            'transit': '大眾運輸',
-            'driving': '開車',
-            'walking': '步行',
-            'bicycling': '騎車'
-        }
         transport_mode = travel_info.get('transport_mode', self.travel_mode)
-        transport_chinese = transport_display.get(transport_mode, transport_mode)
+        transport_chinese = self.TRANSPORT_DISPLAY.get(
+            transport_mode, transport_mode)
     
         return {
-            'step': len(self.visited_places),
+            # 項目建立後才會加入行程，目前長度就是它在行程中的位置
+            'step': len(self._itinerary),
             'name': place.name,
             'label': display_label,
             'hours': matching_hours,
             'lat': place.lat,
             'lon': place.lon,
-            'start_time': arrival_time.strftime('%H:%M'),
-            'end_time': departure_time.strftime('%H:%M'),
+            'start_time': TimeService.format_minutes(arrival_min),
+            'end_time': TimeService.format_minutes(departure_min),
+            # 同時保留整數分鐘數，使用端計算或序列化時不必再解析字串
+            'start_min': arrival_min,
+            'end_min': departure_min,
             'duration': place.duration_min,
             'transport': {
                 'mode': transport_chinese,
@@ -437,7 +706,8 @@ class BasePlanningStrategy:
 
         # 檢查是否營業
         weekday = arrival_time.isoweekday()
-        if not place.is_open_at(weekday, arrival_time.strftime('%H:%M')):
+        arrival_min = arrival_time.hour * 60 + arrival_time.minute
+        if not place.is_open_at_minutes(weekday, arrival_min):
             print("該時段未營業")
             return False
 
@@ -1,14 +1,90 @@
 # src/core/planner/system.py
 
 
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List
+from functools import cached_property
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
 from ..evaluator.place_scoring import PlaceScoring
 from ..models.place import PlaceDetail
+from ..models.place_arrays import PlaceArrays
+from ..models.trip import TripRequirement
 from .strategy import BasePlanningStrategy
+from ..utils.distance_matrix import DistanceMatrix
 from ..services.geo_service import GeoService
 from ..services.time_service import TimeService
 from ..utils.navigation_translator import NavigationTranslator
+from ..utils.validator import ValidationError
+
+
+# 設定 TRIP_SILENT=1 時不輸出行程結果（效能測試或輸出導向記錄檔時使用），
+# 連字串格式化都省略
+_SILENT = os.environ.get('TRIP_SILENT') == '1'
+
+# 起點/終點使用的全天營業時間，唯讀且所有星期共用同一個時段
+_ALWAYS_OPEN_SLOTS = ({'start': '00:00', 'end': '23:59'},)
+_ALWAYS_OPEN_HOURS = MappingProxyType(
+    {i: _ALWAYS_OPEN_SLOTS for i in range(1, 8)})
+
+# 預設起點，PlaceDetail 不可修改，所有規劃系統共用同一個物件
+_DEFAULT_START_POINT = "台北車站"
+_DEFAULT_START_LOCATION = PlaceDetail(
+    name=_DEFAULT_START_POINT,
+    lat=25.0478,
+    lon=121.5170,
+    duration_min=0,
+    label='交通樞紐',
+    period='morning',
+    hours=_ALWAYS_OPEN_HOURS
+)
+
+# 規劃需求的預設值，唯讀，每次規劃時複製一份再套用使用者設定
+_DEFAULT_REQUIREMENT = MappingProxyType({
+    "start_time": "09:00",                # 預設早上9點開始
+    "end_time": "21:00",                  # 預設晚上9點結束
+    "start_point": _DEFAULT_START_POINT,  # 預設起點
+    "end_point": None,                    # 預設終點（會使用起點）
+    "transport_mode": "driving",          # 預設開車
+    "distance_threshold": 30,             # 預設最大30公里
+    "lunch_time": "12:00",                # 預設中午12點午餐
+    "dinner_time": "18:00"                # 預設晚上6點晚餐
+})
+
+# 行程輸出中每個地點的樣板，巢狀的交通資訊以索引語法取值
+_PLAN_FORMAT = (
+    "\n[地點 {step}]\n"
+    "名稱: {name}\n"
+    "時間: {start_time} - {end_time}\n"
+    "停留: {duration}分鐘 "
+    "交通: {transport[mode]}({transport[time]}分鐘)"
+)
+
+# 平行規劃時，每個工作行程各自持有的規劃系統與情境列表
+_worker_system = None
+_worker_scenarios = None
+
+
+def _init_plan_worker(scenarios: List[Tuple[List[Dict], Dict]]) -> None:
+    """初始化平行規劃的工作行程
+
+    每個工作行程只建立一次規劃系統，同一份地點列表在該行程內
+    重複規劃時可以沿用已轉換的地點與距離矩陣
+    """
+    global _worker_system, _worker_scenarios
+    _worker_system = TripPlanningSystem()
+    _worker_scenarios = scenarios
+
+
+def _plan_worker(index: int) -> List[Dict]:
+    """在工作行程中執行第 index 個規劃情境"""
+    locations, requirement = _worker_scenarios[index]
+    return _worker_system.plan_trip(locations, requirement)
 
 
 class TripPlanningSystem:
@@ -28,21 +104,44 @@ class TripPlanningSystem:
             lunch_time="12:00",   # 預設中午12點用餐
             dinner_time="18:00"   # 預設晚上6點用餐
         )
+        self._meal_minutes = (12 * 60, 18 * 60)
 
-        # 初始化其他服務
-        self.geo_service = GeoService()
-        self.place_scoring = PlaceScoring(
-            time_service=self.time_service,
-            geo_service=self.geo_service
-        )
+        # 地理服務與評分服務在第一次使用時才建立，見 geo_service / place_scoring
 
         # 初始化策略系統
         self.strategy = None
 
-        # 執行狀態追蹤
+        # 執行狀態追蹤（秒數與整數奈秒數）
         self.execution_time = 0.0
+        self.execution_time_ns = 0
+
+        # 地點轉換與距離矩陣的快取，重複使用同一份地點列表時不必重新計算
+        self._places_cache = None
+        self._matrix_cache = None
+
+        # 起點/終點名稱對應的 PlaceDetail，重複規劃時不必再查詢座標
+        self._location_cache: Dict[str, PlaceDetail] = {}
 
-    def plan_trip(self, locations: List[Dict], requirement: Dict) -> List[Dict]:
+    @cached_property
+    def geo_service(self) -> GeoService:
+        """地理服務
+
+        建立時會初始化 Google Maps 用戶端，延後到第一次使用時才建立，
+        只用到驗證或快取等功能時不必付出這個成本
+        """
+        return GeoService()
+
+    @cached_property
+    def place_scoring(self) -> PlaceScoring:
+        """地點評分服務，第一次使用時才建立"""
+        return PlaceScoring(
+            time_service=self.time_service,
+            geo_service=self.geo_service
+        )
+
+    def plan_trip(self,
+                  locations: List[Dict],
+                  requirement: Union[Dict, TripRequirement]) -> List[Dict]:
         """執行行程規劃
 
         輸入參數:
@@ -62,86 +161,258 @@ class TripPlanningSystem:
                 - dinner_time: str - 晚餐時間(HH:MM)
                 - transport_mode: str - 交通方式
                 - distance_threshold: float - 最大可接受距離(公里)
+                - date: str - 出發日期(MM-DD)，用來決定星期幾的營業時間
+                也可以直接傳入已驗證的 TripRequirement，不會重新驗證
 
         回傳:
             List[Dict]: 規劃好的行程列表
         """
-        start_time = datetime.now()
-
-        try:
-            # 先設定預設值
-            default_requirement = {
-                "start_time": "09:00",        # 預設早上9點開始
-                "end_time": "21:00",          # 預設晚上9點結束
-                "start_point": "台北車站",     # 預設起點
-                "end_point": None,            # 預設終點（會使用起點）
-                "transport_mode": "driving",   # 預設開車
-                "distance_threshold": 30,      # 預設最大30公里
-                "lunch_time": "12:00",        # 預設中午12點午餐
-                "dinner_time": "18:00"        # 預設晚上6點晚餐
-            }
-            # 更新預設值，只使用非 None 的使用者設定
-            for key, value in requirement.items():
-                if value is not None:
-                    default_requirement[key] = value
+        start_ns = time.perf_counter_ns()
+
+        # 先設定預設值
+        default_requirement = dict(_DEFAULT_REQUIREMENT)
+        # 已驗證的 TripRequirement 直接逐欄讀取，不必再經過欄位驗證；
+        # 其中以 "none" 表示未設定的欄位與 None 同樣沿用預設值
+        if isinstance(requirement, TripRequirement):
+            items = ((key, None if value == "none" else value)
+                     for key, value in requirement)
+        else:
+            items = requirement.items()
+
+        # 更新預設值，只使用非 None 的使用者設定
+        for key, value in items:
+            if value is not None:
+                default_requirement[key] = value
+
+        # 使用更新後的設定值
+        requirement = default_requirement
+
+        # 先檢查時間範圍，不合法時不必查詢座標或轉換地點
+        start_time, end_time = self._get_trip_times(requirement)
+
+        # 起點與終點需要查詢座標時一次並行送出
+        geocoded = self._geocode_endpoints(
+            requirement.get('start_point'),
+            requirement.get('end_point')
+        )
 
-            # 使用更新後的設定值
-            requirement = default_requirement
+        # 設定起點和終點
+        self.start_location = self._get_start_location(
+            requirement.get('start_point'), geocoded
+        )
+        self.end_location = self._get_end_location(
+            requirement.get('end_point'), geocoded
+        )
 
-            # 設定起點和終點
-            self.start_location = self._get_start_location(
-                requirement.get('start_point')
-            )
-            self.end_location = self._get_end_location(
-                requirement.get('end_point')
+        # 更新時間服務的用餐時間設定
+        if requirement.get('lunch_time'):
+            self._update_meal_times(
+                requirement['lunch_time'],
+                requirement.get('dinner_time', "18:00")
             )
 
-            # 更新時間服務的用餐時間設定
-            if requirement.get('lunch_time'):
-                self.time_service = TimeService(
-                    lunch_time=requirement['lunch_time'],
-                    dinner_time=requirement.get('dinner_time', "18:00")
-                )
-
-            # 轉換地點資料為 PlaceDetail 物件
-            available_places = [
-                PlaceDetail(**location) if isinstance(location, dict)
-                else location for location in locations
-            ]
-
-            # 準備規劃上下文
-            context = {
-                'start_time': datetime.strptime(requirement['start_time'], '%H:%M'),
-                'end_time': datetime.strptime(requirement['end_time'], '%H:%M'),
-                'travel_mode': requirement.get('transport_mode', 'driving'),
-                'distance_threshold': requirement.get('distance_threshold', 30),
-                'start_location': self.start_location,
-                'end_location': self.end_location,
-            }
+        # 轉換地點資料為 PlaceDetail 物件及欄位式陣列
+        available_places, place_arrays = self._prepare_places(locations)
 
-            # 初始化並執行規劃策略
-            self.strategy = BasePlanningStrategy(
-                time_service=self.time_service,
-                geo_service=self.geo_service,
-                place_scoring=self.place_scoring,
-                config=context
-            )
+        # 預先計算起點、終點與所有地點間的距離矩陣
+        distance_matrix = self._prepare_distance_matrix(
+            available_places,
+            requirement.get('transport_mode', 'driving'),
+            requirement.get('distance_threshold', 30)
+        )
 
-            # 執行規劃
-            itinerary = self.strategy.execute(
-                current_location=self.start_location,
-                available_places=available_places,
-                current_time=context['start_time']
-            )
+        # 準備規劃上下文
+        context = {
+            'start_time': start_time,
+            'end_time': end_time,
+            'travel_mode': requirement.get('transport_mode', 'driving'),
+            'distance_threshold': requirement.get('distance_threshold', 30),
+            'start_location': self.start_location,
+            'end_location': self.end_location,
+            'distance_matrix': distance_matrix,
+            'place_arrays': place_arrays,
+        }
+
+        # 初始化並執行規劃策略
+        self.strategy = BasePlanningStrategy(
+            time_service=self.time_service,
+            geo_service=self.geo_service,
+            place_scoring=self.place_scoring,
+            config=context
+        )
+
+        # 執行規劃
+        itinerary = self.strategy.execute(
+            current_location=self.start_location,
+            available_places=available_places,
+            current_time=context['start_time']
+        )
+
+        # 記錄執行時間，保留整數奈秒數供多次規劃累加時使用
+        self.execution_time_ns = time.perf_counter_ns() - start_ns
+        self.execution_time = self.execution_time_ns / 1e9
+
+        return itinerary
+
+    def _update_meal_times(self, lunch_time: str, dinner_time: str) -> None:
+        """依用餐時間更新時間服務
+
+        用餐時間與目前設定相同時沿用原本的時間服務（每次規劃開始時會重置狀態），
+        不同時才重新建立，並讓評分服務改用新的時間服務
+
+        輸入參數:
+            lunch_time: str - 午餐時間(HH:MM)
+            dinner_time: str - 晚餐時間(HH:MM)
+        """
+        meal_minutes = (TimeService.to_minutes(lunch_time),
+                        TimeService.to_minutes(dinner_time))
+        if meal_minutes == self._meal_minutes:
+            return
+
+        self.time_service = TimeService(
+            lunch_time=lunch_time,
+            dinner_time=dinner_time
+        )
+        self._meal_minutes = meal_minutes
+
+        # 評分服務已建立時，改用新的時間服務判斷時段
+        if 'place_scoring' in vars(self):
+            self.place_scoring.time_service = self.time_service
+
+    def plan_many(self,
+                  scenarios: List[Tuple[List[Dict], Dict]],
+                  max_workers: Optional[int] = None) -> List[List[Dict]]:
+        """平行執行多組行程規劃
+
+        每組情境彼此獨立，交由多個行程同時規劃。
+        Linux 上使用 fork 啟動工作行程，地點資料以寫入時複製的方式共用，
+        不需要為每個情境重新序列化。
 
-            # 記錄執行時間
-            self.execution_time = (datetime.now() - start_time).total_seconds()
+        輸入參數:
+            scenarios: List[Tuple[List[Dict], Dict]] - 規劃情境列表，
+                       每個情境為 (地點列表, 規劃需求)
+            max_workers: Optional[int] - 最多使用的行程數，預設依 CPU 數量決定
+
+        回傳:
+            List[List[Dict]]: 與情境順序相同的行程列表
+
+        使用範例:
+            >>> results = system.plan_many([
+            ...     (locations, {'start_time': '09:00', 'date': '12-25'}),
+            ...     (locations, {'start_time': '10:00', 'date': '12-26'}),
+            ... ])
+        """
+        if not scenarios:
+            return []
+
+        if 'fork' in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context('fork')
+        else:
+            mp_context = None
+
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=mp_context,
+                                 initializer=_init_plan_worker,
+                                 initargs=(scenarios,)) as executor:
+            return list(executor.map(_plan_worker, range(len(scenarios))))
+
+    def _get_trip_times(self, requirement: Dict) -> Tuple[datetime, datetime]:
+        """取得行程的開始與結束時間
+
+        有指定出發日期時，時間會落在該日期上，
+        營業時間的檢查就會使用當天實際的星期幾
+
+        輸入參數:
+            requirement: Dict - 已套用預設值的規劃需求
+
+        回傳:
+            Tuple[datetime, datetime]: (開始時間, 結束時間)
+
+        異常:
+            ValidationError: 結束時間沒有晚於開始時間
+        """
+        # 以分鐘數比較，不依賴字串的字典序（如 "9:00" 與 "10:00"）
+        start_min = TimeService.to_minutes(requirement['start_time'])
+        end_min = TimeService.to_minutes(requirement['end_time'])
+        if start_min >= end_min:
+            raise ValidationError("結束時間必須晚於開始時間", "time_range")
 
-            return itinerary
+        date_str = requirement.get('date')
+        if date_str and date_str != "none":
+            trip_date = TimeService.parse_trip_date(date_str)
+        else:
+            trip_date = datetime(1900, 1, 1)
 
-        except Exception as e:
-            print(f"行程規劃失敗: {str(e)}")
-            raise
+        start_time = trip_date.replace(hour=start_min // 60, minute=start_min % 60)
+        end_time = trip_date.replace(hour=end_min // 60, minute=end_min % 60)
+
+        return start_time, end_time
+
+    def _prepare_places(self, locations: List[Dict]) -> Tuple[List[PlaceDetail], PlaceArrays]:
+        """轉換地點資料並快取結果
+
+        以地點列表及其中每個元素的物件身分作為快取鍵值，
+        重複傳入同一份列表時直接回傳上次轉換的結果。
+        若直接修改列表內的字典內容，需先呼叫 clear_cache()。
+
+        輸入參數:
+            locations: List[Dict] - 原始地點資料，也可以是已轉換的 PlaceDetail 列表
+
+        回傳:
+            Tuple[List[PlaceDetail], PlaceArrays]: 地點物件列表及欄位式陣列
+        """
+        item_ids = tuple(id(location) for location in locations)
+        if self._places_cache is not None:
+            cached_locations, cached_ids, places, place_arrays = self._places_cache
+            if cached_locations is locations and cached_ids == item_ids:
+                return places, place_arrays
+
+        # 已驗證過的地點物件（例如重新規劃時）直接沿用，不會重新轉換
+        available_places = PlaceDetail.bulk_from(locations)
+
+        # 將地點資料攤平為欄位式陣列，供規劃策略向量化篩選
+        place_arrays = PlaceArrays.from_places(available_places)
+
+        self._places_cache = (locations, item_ids, available_places, place_arrays)
+        self._matrix_cache = None
+        return available_places, place_arrays
+
+    def _prepare_distance_matrix(self,
+                                 available_places: List[PlaceDetail],
+                                 travel_mode: str,
+                                 distance_threshold: float) -> DistanceMatrix:
+        """建立起點、終點與所有地點間的距離矩陣並快取結果
+
+        地點列表、起點、終點皆為同一批物件，且交通方式與距離上限相同時沿用上次的矩陣
+
+        輸入參數:
+            available_places: List[PlaceDetail] - 已轉換的地點列表
+            travel_mode: str - 交通方式
+            distance_threshold: float - 最大可接受距離(公里)，超出的組合記為 inf
+
+        回傳:
+            DistanceMatrix: 距離矩陣
+        """
+        key = (id(available_places), id(self.start_location),
+               id(self.end_location), travel_mode, distance_threshold)
+        if self._matrix_cache is not None and self._matrix_cache[0] == key:
+            return self._matrix_cache[1]
+
+        matrix_places = [self.start_location] + available_places
+        if self.end_location is not self.start_location:
+            matrix_places.append(self.end_location)
+        distance_matrix = self.geo_service.build_distance_matrix(
+            matrix_places, mode=travel_mode, max_distance=distance_threshold)
+
+        # 矩陣內保留了所有地點的參考，鍵值中的 id 不會被重複使用
+        self._matrix_cache = (key, distance_matrix)
+        return distance_matrix
+
+    def clear_cache(self) -> None:
+        """清除地點轉換、距離矩陣與起點/終點的快取"""
+        self._places_cache = None
+        self._matrix_cache = None
+        self._location_cache.clear()
 
     def _prepare_planning_context(self, locations: List[PlaceDetail], requirement: Dict) -> Dict:
         """準備規劃上下文
@@ -161,21 +432,18 @@ class TripPlanningSystem:
         # 從 requirement 中取得起點，如果沒有則使用預設值
         start_point = requirement.get('start_point', "台北車站")
 
-        # 取得並轉換起點資訊
+        # 取得起點資訊
         start_location = self._get_start_location(start_point)
-        if isinstance(start_location, dict):
-            start_location = PlaceDetail(**start_location)
+
+        # 開始與結束時間以整數分鐘數解析，不經過 strptime
+        start_time, end_time = self._get_trip_times(requirement)
 
         # 準備完整的規劃上下文
         context = {
             'start_location': start_location,
             'available_places': locations,
-            'start_time': datetime.strptime(
-                requirement['start_time'], '%H:%M'
-            ),
-            'end_time': datetime.strptime(
-                requirement['end_time'], '%H:%M'
-            ),
+            'start_time': start_time,
+            'end_time': end_time,
             'travel_mode': requirement.get('transport_mode', 'driving'),
             'theme': requirement.get('theme'),
             'meal_times': {
@@ -193,74 +461,133 @@ class TripPlanningSystem:
             itinerary: List[Dict] - 規劃好的行程列表
             show_navigation: bool - 是否顯示詳細導航資訊
         """
-        print("\n=== 行程規劃結果 ===")
+        if _SILENT:
+            return
 
-        total_travel_time = 0
-        total_duration = 0
+        # 先組好所有輸出內容，最後一次寫入標準輸出
+        lines = ["", "=== 行程規劃結果 ==="]
 
         for plan in itinerary:
-            # 顯示地點資訊
-            print(f"\n[地點 {plan['step']}]")
-            print(f"名稱: {plan['name']}")
-            print(f"時間: {plan['start_time']} - {plan['end_time']}")
-            print(f"停留: {plan['duration']}分鐘", end=' ')
-            print(
-                f"交通: {plan['transport']['mode']}({plan['transport']['time']}分鐘)")
+            # 顯示地點資訊，每個地點以同一個樣板組成一段字串
+            lines.append(_PLAN_FORMAT.format_map(plan))
 
             # 如果需要，顯示詳細導航
             if show_navigation and 'route_info' in plan:
-                print("\n前往下一站的導航:")
-                print(NavigationTranslator.format_navigation(
+                lines.append("\n前往下一站的導航:")
+                lines.append(NavigationTranslator.format_navigation(
                     plan['route_info']))
 
-            total_travel_time += plan['transport']['time']
-            total_duration += plan['duration']
-
         # 顯示統計資訊
-        print("\n=== 統計資訊 ===")
-        print(f"總景點數: {len(itinerary)}個")
-        print(f"總時間: {(total_duration + total_travel_time)/60:.1f}小時")
-        print(f"- 遊玩時間: {total_duration/60:.1f}小時")
-        print(f"- 交通時間: {total_travel_time/60:.1f}小時")
+        summary = self.summarize(itinerary)
+        total_duration = summary['total_duration']
+        total_travel_time = summary['total_travel_time']
+
+        lines.append("\n=== 統計資訊 ===")
+        lines.append(f"總景點數: {len(itinerary)}個")
+        lines.append(f"總時間: {(total_duration + total_travel_time)/60:.1f}小時")
+        lines.append(f"- 遊玩時間: {total_duration/60:.1f}小時")
+        lines.append(f"- 交通時間: {total_travel_time/60:.1f}小時")
+
+        lines.append(f"規劃耗時: {self.execution_time:.2f}秒")
+
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    @staticmethod
+    def _get_time_arrays(itinerary: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """取出行程中各站的停留時間與交通時間
 
-        print(f"規劃耗時: {self.execution_time:.2f}秒")
+        輸入參數:
+            itinerary: List[Dict] - 規劃好的行程列表
+
+        回傳:
+            Tuple[np.ndarray, np.ndarray]: (停留時間, 交通時間)，單位皆為分鐘
+        """
+        count = len(itinerary)
+        durations = np.fromiter(
+            (plan['duration'] for plan in itinerary),
+            dtype=np.int32, count=count
+        )
+        travel_times = np.fromiter(
+            (plan['transport']['time'] for plan in itinerary),
+            dtype=np.float64, count=count
+        )
+        return durations, travel_times
 
-    def _get_start_location(self, start_point: str) -> PlaceDetail:
+    @classmethod
+    def summarize(cls, itinerary: List[Dict]) -> Dict:
+        """計算行程的總停留時間與總交通時間
+
+        輸入參數:
+            itinerary: List[Dict] - 規劃好的行程列表
+
+        回傳:
+            Dict: {
+                'total_duration': int,        # 總停留時間（分鐘）
+                'total_travel_time': float    # 總交通時間（分鐘）
+            }
+        """
+        durations, travel_times = cls._get_time_arrays(itinerary)
+        return {
+            'total_duration': int(durations.sum()),
+            'total_travel_time': float(travel_times.sum())
+        }
+
+    def _geocode_endpoints(self,
+                           start_point: Optional[str],
+                           end_point: Optional[str]) -> Dict:
+        """並行查詢起點與終點的座標
+
+        預設起點（台北車站）與未指定的終點不需要查詢
+
+        輸入參數:
+            start_point: Optional[str] - 起點名稱
+            end_point: Optional[str] - 終點名稱
+
+        回傳:
+            Dict: 地點名稱對應的座標字典，查詢失敗時為例外物件
+        """
+        names = []
+        if start_point:
+            names.append(start_point)
+        if end_point and end_point != "none" and end_point not in names:
+            names.append(end_point)
+
+        # 預設起點（終點也可能是它）與已快取的地點不必再查詢
+        names = [name for name in names
+                 if name != _DEFAULT_START_POINT and name not in self._location_cache]
+
+        results = self.geo_service.geocode_many(names, return_exceptions=True)
+        return dict(zip(names, results))
+
+    def _get_start_location(self,
+                            start_point: str,
+                            geocoded: Optional[Dict] = None) -> PlaceDetail:
         """處理起點設定
 
         將起點資訊轉換為 PlaceDetail 物件
 
         輸入參數:
             start_point: str - 起點的名稱
+            geocoded: Optional[Dict] - 已查詢好的座標，見 _geocode_endpoints
 
         回傳:
             PlaceDetail - 起點的完整資訊物件
         """
-        # 準備預設的起點資料
-        default_location = {
-            'name': '台北車站',
-            'lat': 25.0478,
-            'lon': 121.5170,
-            'duration_min': 0,
-            'label': '交通樞紐',
-            'period': 'morning',
-            'hours': {i: [{'start': '00:00', 'end': '23:59'}]
-                      for i in range(1, 8)}
-        }
-
-        if not start_point or start_point == "台北車站":
+        if not start_point or start_point == _DEFAULT_START_POINT:
             # 使用預設起點
-            return PlaceDetail(**default_location)
+            return self._get_cached_location(_DEFAULT_START_POINT)
 
         try:
             # 如果有指定其他起點，取得該地點資訊
-            location = self._get_location_info(start_point)
-            return PlaceDetail(**location)
-        except Exception as e:
+            return self._get_cached_location(start_point, geocoded)
+        except (RuntimeError, ValueError) as e:
+            # 查詢失敗或座標無效時改用預設值，其他錯誤直接拋出
             print(f"無法取得起點資訊，使用預設起點: {str(e)}")
-            return PlaceDetail(**default_location)
+            return self._get_cached_location(_DEFAULT_START_POINT)
 
-    def _get_end_location(self, end_point: str) -> PlaceDetail:
+    def _get_end_location(self,
+                          end_point: str,
+                          geocoded: Optional[Dict] = None) -> PlaceDetail:
         """取得終點位置資訊
 
         如果沒有指定終點，會使用起點作為終點
@@ -268,6 +595,7 @@ class TripPlanningSystem:
 
         輸入參數:
             end_point: Optional[str] - 終點名稱，可以是 None
+            geocoded: Optional[Dict] - 已查詢好的座標，見 _geocode_endpoints
 
         回傳:
             PlaceDetail - 終點的完整資訊物件
@@ -278,30 +606,61 @@ class TripPlanningSystem:
 
         try:
             # 如果有指定終點，取得該地點資訊
-            location = self._get_location_info(end_point)
-            return PlaceDetail(**location)
-        except Exception as e:
+            return self._get_cached_location(end_point, geocoded)
+        except (RuntimeError, ValueError) as e:
+            # 查詢失敗或座標無效時改用預設值，其他錯誤直接拋出
             print(f"無法取得終點資訊，使用起點作為終點: {str(e)}")
             return self.start_location
 
-    def _get_location_info(self, place_name: str) -> Dict:
+    def _get_cached_location(self,
+                             place_name: str,
+                             geocoded: Optional[Dict] = None) -> PlaceDetail:
+        """取得起點/終點的 PlaceDetail，同一名稱只查詢與建立一次
+
+        PlaceDetail 不可修改，快取的物件可以在多次規劃間共用
+
+        輸入參數:
+            place_name: str - 地點名稱
+            geocoded: Optional[Dict] - 已查詢好的座標，見 _geocode_endpoints
+
+        回傳:
+            PlaceDetail - 地點的完整資訊物件
+        """
+        location = self._location_cache.get(place_name)
+        if location is None:
+            if place_name == _DEFAULT_START_POINT:
+                location = _DEFAULT_START_LOCATION
+            else:
+                location = PlaceDetail(
+                    **self._get_location_info(place_name, geocoded))
+            self._location_cache[place_name] = location
+        return location
+
+    def _get_location_info(self,
+                           place_name: str,
+                           geocoded: Optional[Dict] = None) -> Dict:
         """取得地點詳細資訊
 
         使用地理服務來取得指定地點的完整資訊，包括：
         1. 座標位置
         2. 基本資訊
         3. 營業時間等
+
+        已在 geocoded 中查詢過的地點直接使用結果，不再重新查詢
         """
-        try:
+        if geocoded and place_name in geocoded:
+            location = geocoded[place_name]
+            if isinstance(location, Exception):
+                raise location
+        else:
             location = self.geo_service.geocode(place_name)
-            return {
-                'name': place_name,
-                'lat': location['lat'],
-                'lon': location['lon'],
-                'duration_min': 0,  # 起點/終點不需要停留時間
-                'label': '交通樞紐',
-                'period': 'morning',  # 起點預設為早上時段
-                'hours': {i: [{'start': '00:00', 'end': '23:59'}] for i in range(1, 8)}
-            }
-        except Exception as e:
-            raise ValueError(f"無法取得地點資訊: {str(e)}")
+
+        return {
+            'name': place_name,
+            'lat': location['lat'],
+            'lon': location['lon'],
+            'duration_min': 0,  # 起點/終點不需要停留時間
+            'label': '交通樞紐',
+            'period': 'morning',  # 起點預設為早上時段
+            'hours': _ALWAYS_OPEN_HOURS
+        }
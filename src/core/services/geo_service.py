@@ -1,13 +1,18 @@
 # src/core/services/geo_service.py
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Union
 import math
-import googlemaps
-from ..models.place import PlaceDetail
-from ..utils.cache_decorator import geo_cache
+import numpy as np
+from ..utils.cache_decorator import cached, geo_cache
+from ..utils.distance_matrix import DistanceMatrix
 from ...config import GOOGLE_MAPS_API_KEY
 
+if TYPE_CHECKING:
+    # 只用於型別標註，避免 models 與 services 互相匯入
+    from ..models.place import PlaceDetail
+
 
 class GeoService:
     """地理服務類別
@@ -37,15 +42,21 @@ class GeoService:
     }
 
     def __init__(self):
-        """初始化地理服務"""
+        """初始化地理服務
+
+        googlemaps 連帶載入 requests、urllib3 等套件，匯入成本高，
+        延後到建立服務時才匯入，只用到距離計算等類別方法時不必載入
+        """
         try:
+            import googlemaps
             self.maps_client = googlemaps.Client(key=GOOGLE_MAPS_API_KEY)
             self.has_google_maps = True
         except Exception as e:
             print(f"警告：Google Maps 服務初始化失敗: {str(e)}")
             self.has_google_maps = False
 
-    def calculate_distance(self,
+    @classmethod
+    def calculate_distance(cls,
                            point1: Dict[str, float],
                            point2: Dict[str, float]) -> float:
         """計算兩點間的直線距離
@@ -65,16 +76,24 @@ class GeoService:
             >>> p2 = {'lat': 25.1, 'lon': 121.6}
             >>> distance = geo_service.calculate_distance(p1, p2)
         """
-        # 驗證座標
-        if not all(self.validate_coordinates(p['lat'], p['lon'])
-                   for p in [point1, point2]):
+        # 驗證座標，座標只取出一次，直接比較範圍，
+        # 不為每個點建立列表並逐一呼叫 validate_coordinates
+        try:
+            lat1 = float(point1['lat'])
+            lon1 = float(point1['lon'])
+            lat2 = float(point2['lat'])
+            lon2 = float(point2['lon'])
+        except (TypeError, ValueError):
+            raise ValueError("無效的座標")
+        if not (-90 <= lat1 <= 90 and -180 <= lon1 <= 180 and
+                -90 <= lat2 <= 90 and -180 <= lon2 <= 180):
             raise ValueError("無效的座標")
 
         # 轉換為弧度
-        lat1 = math.radians(point1['lat'])
-        lon1 = math.radians(point1['lon'])
-        lat2 = math.radians(point2['lat'])
-        lon2 = math.radians(point2['lon'])
+        lat1 = math.radians(lat1)
+        lon1 = math.radians(lon1)
+        lat2 = math.radians(lat2)
+        lon2 = math.radians(lon2)
 
         # Haversine 公式計算
         dlat = lat2 - lat1
@@ -84,14 +103,62 @@ class GeoService:
              math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2)
         c = 2 * math.asin(math.sqrt(a))
 
-        return round(self.EARTH_RADIUS * c, 1)
+        return round(cls.EARTH_RADIUS * c, 1)
+
+    def build_distance_matrix(self,
+                              places: List['PlaceDetail'],
+                              mode: Optional[str] = None,
+                              use_haversine: bool = False,
+                              max_distance: Optional[float] = None) -> DistanceMatrix:
+        """預先計算所有地點兩兩之間的直線距離與預估交通時間
+
+        規劃過程會反覆查詢同一批地點之間的距離，
+        先一次算好 N×N 矩陣，之後只需要查表。
+        預估交通時間與 API 失敗時的備用估算方式相同。
+
+        參數:
+            places: 要納入矩陣的地點列表
+            mode: 交通方式，有設定時一併計算交通時間矩陣
+            use_haversine: 是否改用 Haversine 公式，預設使用 CheapRuler 近似
+            max_distance: 距離上限（公里），超出的組合記為 inf
+
+        回傳:
+            DistanceMatrix: 距離矩陣（公里）
+
+        使用範例:
+            >>> matrix = geo_service.build_distance_matrix(places)
+            >>> distance = matrix.distance(places[0], places[1])
+        """
+        # 一次檢查所有座標，不必逐一呼叫 validate_coordinates
+        lat, lon = DistanceMatrix.coordinates(places)
+        invalid = ~((np.abs(lat) <= 90) & (np.abs(lon) <= 180))
+        if invalid.any():
+            raise ValueError(f"無效的座標: {places[int(invalid.argmax())].name}")
+
+        if mode is None:
+            return DistanceMatrix(places,
+                                  use_haversine=use_haversine,
+                                  max_distance=max_distance)
+
+        # 與 _calculate_estimated_travel_info 使用相同的速度與修正係數
+        speed = self.DEFAULT_SPEEDS.get(mode, 30)
+        time_factor = 1.4 if mode == 'driving' else 1.3
+
+        return DistanceMatrix(
+            places,
+            use_haversine=use_haversine,
+            speed_kmh=speed,
+            time_factor=time_factor,
+            max_distance=max_distance
+        )
 
     @geo_cache(maxsize=256)
     def get_route(self,
                   origin: Dict[str, float],
                   destination: Dict[str, float],
                   mode: str = 'driving',
-                  departure_time: Optional[datetime] = None) -> Dict:
+                  departure_time: Optional[datetime] = None,
+                  distance: Optional[float] = None) -> Dict:
         """規劃兩點間的路線
 
         輸入參數:
@@ -99,6 +166,8 @@ class GeoService:
             destination: Dict - 終點座標 {'lat': float, 'lon': float}
             mode: str - 交通方式('driving'/'transit'/'walking'/'bicycling')
             departure_time: Optional[datetime] - 出發時間，預設為當前時間
+            distance: Optional[float] - 已算好的兩點直線距離（公里），
+                      使用預估方式時直接沿用，不再重新計算
 
         回傳:
             Dict: {
@@ -117,7 +186,8 @@ class GeoService:
             print(f"警告：Google Maps 路線規劃失敗，切換到備用方案: {str(e)}")
 
         # API 失敗時使用預估方式
-        return self._calculate_estimated_travel_info(origin, destination, mode)
+        return self._calculate_estimated_travel_info(
+            origin, destination, mode, distance)
 
     def _get_google_maps_route(self,
                                origin: Dict[str, float],
@@ -125,9 +195,10 @@ class GeoService:
                                mode: str,
                                departure_time: Optional[datetime]) -> Dict:
         """使用 Google Maps API 取得路線規劃"""
-        # 確保出發時間是未來時間
-        if departure_time is None or departure_time < datetime.now():
-            departure_time = datetime.now()
+        # 確保出發時間是未來時間，目前時間只取一次
+        now = datetime.now()
+        if departure_time is None or departure_time < now:
+            departure_time = now
 
         # 轉換座標格式
         origin_str = f"{origin['lat']},{origin['lon']}"
@@ -154,31 +225,8 @@ class GeoService:
             'transport_mode': mode
         }
 
-    def _get_estimated_route(self,
-                             origin: Dict[str, float],
-                             destination: Dict[str, float],
-                             mode: str) -> Dict:
-        """使用直線距離估算路線"""
-        # 計算直線距離
-        distance = self.calculate_distance(origin, destination)
-
-        # 根據交通方式計算預估時間
-        speed = self.DEFAULT_SPEEDS.get(mode, self.DEFAULT_SPEEDS['driving'])
-        duration = (distance / speed) * 60  # 轉換為分鐘
-
-        # 加入路程曲折的修正係數（實際路程通常比直線距離長）
-        distance_factor = 1.3 if mode == 'driving' else 1.2
-        time_factor = 1.4 if mode == 'driving' else 1.3
-
-        return {
-            'distance_km': round(distance * distance_factor, 1),
-            'duration_minutes': int(duration * time_factor),
-            'route_info': None,
-            'is_estimated': True,
-            'transport_mode': mode
-        }
-
-    def validate_coordinates(self, lat: float, lon: float) -> bool:
+    @classmethod
+    def validate_coordinates(cls, lat: float, lon: float) -> bool:
         """驗證座標是否有效
 
         檢查座標值是否在合理範圍內：
@@ -273,18 +321,34 @@ class GeoService:
         """
         # 先計算矩形範圍
         bounds = self.calculate_bounds(center, max_distance_km)
+        if not points:
+            return []
+
+        # 第一階段：以經緯度陣列一次完成矩形範圍過濾
+        n = len(points)
+        lat = np.fromiter((point['lat'] for point in points), dtype=np.float64, count=n)
+        lon = np.fromiter((point['lon'] for point in points), dtype=np.float64, count=n)
+        in_bounds = np.flatnonzero(
+            (lat >= bounds['min_lat']) & (lat <= bounds['max_lat']) &
+            (lon >= bounds['min_lon']) & (lon <= bounds['max_lon']))
+
+        lat = lat[in_bounds]
+        lon = lon[in_bounds]
+        if not ((np.abs(lat) <= 90) & (np.abs(lon) <= 180)).all():
+            raise ValueError("無效的座標")
+
+        # 第二階段：只對範圍內的點以向量化 Haversine 公式計算實際距離，
+        # 與 calculate_distance 相同取到小數點後一位
+        distances = DistanceMatrix.haversine(center['lat'], center['lon'], lat, lon)
 
-        # 第一階段：快速過濾
         candidates = []
-        for point in points:
-            if self._is_point_in_bounds(point, bounds):
-                # 計算實際距離
-                distance = self.calculate_distance(center, point)
-                if distance <= max_distance_km:
-                    candidates.append({
-                        **point,
-                        'distance': round(distance, 2)
-                    })
+        for i, distance in zip(in_bounds.tolist(), distances.tolist()):
+            distance = round(distance, 1)
+            if distance <= max_distance_km:
+                candidates.append({
+                    **points[i],
+                    'distance': distance
+                })
 
         # 依據距離排序
         return sorted(candidates, key=lambda x: x['distance'])
@@ -365,13 +429,15 @@ class GeoService:
     def _calculate_estimated_travel_info(self,
                                          origin: Dict[str, float],
                                          destination: Dict[str, float],
-                                         mode: str) -> Dict:
+                                         mode: str,
+                                         distance: Optional[float] = None) -> Dict:
         """計算預估的交通資訊（不需要 API）
 
         輸入參數:
             origin: 起點座標 {'lat': float, 'lon': float}
             destination: 終點座標 {'lat': float, 'lon': float}
             mode: 交通方式('driving'/'transit'/'walking'/'bicycling')
+            distance: 已算好的直線距離（公里），未提供時才即時計算
 
         回傳:
             Dict: {
@@ -381,7 +447,8 @@ class GeoService:
             }
         """
         # 計算直線距離
-        distance = self.calculate_distance(origin, destination)
+        if distance is None:
+            distance = self.calculate_distance(origin, destination)
 
         # 根據交通方式選擇預設速度
         speed = self.DEFAULT_SPEEDS.get(mode, 30)  # 預設 30 km/h
@@ -399,9 +466,13 @@ class GeoService:
             'is_estimated': True
         }
 
+    @cached(maxsize=256)
     def geocode(self, address: str) -> Dict[str, float]:
         """將地址或地點名稱轉換為座標
 
+        結果會快取，同一個地址不會重複呼叫 Google Maps API；
+        查詢失敗不會留在快取中
+
         輸入參數:
             address: str - 地址或地點名稱
 
@@ -422,11 +493,56 @@ class GeoService:
             location = result[0]['geometry']['location']
             return {
                 'lat': location['lat'],
-                'lon': location['lng'],
-                'duration_min': 0,
-                'label': '交通樞紐',
-                'period': 'morning',  # 起點預設為早上時段
-                'hours': {i: [{'start': '00:00', 'end': '23:59'}] for i in range(1, 8)}
+                'lon': location['lng']
             }
         except Exception as e:
             raise RuntimeError(f"地理編碼錯誤: {str(e)}")
+
+    def geocode_many(self,
+                     addresses: List[str],
+                     return_exceptions: bool = False) -> List[Union[Dict[str, float], Exception]]:
+        """同時查詢多個地址的座標
+
+        每次地理編碼都是一次網路往返，多個地址改為並行送出，
+        總等待時間約等於最慢的一次查詢
+
+        輸入參數:
+            addresses: List[str] - 地址或地點名稱列表
+            return_exceptions: bool - 為 True 時，查詢失敗的項目以例外物件放在結果中，
+                               否則遇到第一個失敗就拋出例外
+
+        回傳:
+            List - 與 addresses 順序相同的座標字典（或例外物件）
+
+        異常:
+            RuntimeError - return_exceptions 為 False 且有地址無法取得座標
+
+        使用範例:
+            >>> start, end = geo_service.geocode_many(['中壢火車站', '桃園機場'])
+        """
+        if not addresses:
+            return []
+
+        if len(addresses) == 1:
+            # 只有一個地址時直接查詢，不必建立執行緒池
+            try:
+                return [self.geocode(addresses[0])]
+            except Exception as error:
+                if return_exceptions:
+                    return [error]
+                raise
+
+        with ThreadPoolExecutor(max_workers=len(addresses)) as executor:
+            futures = [executor.submit(self.geocode, address)
+                       for address in addresses]
+
+        results = []
+        for future in futures:
+            error = future.exception()
+            if error is None:
+                results.append(future.result())
+            elif return_exceptions:
+                results.append(error)
+            else:
+                raise error
+        return results
@@ -1,7 +1,10 @@
 # src/core/services/time_service.py
 
+from bisect import bisect_right
 from datetime import datetime, time, timedelta
+from functools import lru_cache
 from typing import Any, Dict, List, Union, Tuple, Optional
+from ..utils.validator import TripValidator
 
 
 class TimeService:
@@ -29,10 +32,14 @@ class TimeService:
             dinner_time: str - 晚餐時間,格式 "HH:MM"
         """
         # 原有的時間設定
-        self.lunch_time = datetime.strptime(
-            lunch_time, self.TIME_FORMAT).time()
-        self.dinner_time = datetime.strptime(
-            dinner_time, self.TIME_FORMAT).time()
+        self.lunch_time = self.to_time(lunch_time)
+        self.dinner_time = self.to_time(dinner_time)
+
+        # 用餐時間的分鐘數，判斷時段時不必每次換算
+        self._lunch_minutes = self.to_minutes(lunch_time)
+        self._dinner_minutes = self.to_minutes(dinner_time)
+        self._period_bounds = self._build_period_bounds(
+            self._lunch_minutes, self._dinner_minutes)
 
         # 新增狀態追蹤
         self.current_period = 'morning'  # 目前時段
@@ -57,8 +64,8 @@ class TimeService:
 
         # 轉換為分鐘方便比較
         current_minutes = current_time.hour * 60 + current_time.minute
-        lunch_minutes = self.lunch_time.hour * 60 + self.lunch_time.minute
-        dinner_minutes = self.dinner_time.hour * 60 + self.dinner_time.minute
+        lunch_minutes = self._lunch_minutes
+        dinner_minutes = self._dinner_minutes
 
         # 時段轉換判斷
         if self.current_period == 'morning':
@@ -109,6 +116,117 @@ class TimeService:
         self.dinner_completed = False
         print("已重置所有時段狀態")
 
+    @classmethod
+    def _build_period_bounds(cls,
+                             lunch_minutes: int,
+                             dinner_minutes: int) -> Optional[Tuple[float, ...]]:
+        """建立 get_time_period 使用的時段分界
+
+        分界依序為午餐開始、午餐結束、晚餐開始、晚餐結束，
+        以 bisect 查詢即可對應到 PERIODS 中的時段名稱。
+        用餐時段包含結束時間，結束分界設在結束後半分鐘。
+        用餐時段跨過午夜或午餐與晚餐重疊時分界不是遞增的，回傳 None。
+
+        參數:
+            lunch_minutes: 午餐時間（當天分鐘數）
+            dinner_minutes: 晚餐時間（當天分鐘數）
+
+        回傳:
+            Optional[Tuple[float, ...]]: 遞增的分界分鐘數
+        """
+        bounds = (
+            lunch_minutes - cls.MEAL_WINDOW,
+            lunch_minutes + cls.MEAL_WINDOW + 0.5,
+            dinner_minutes - cls.MEAL_WINDOW,
+            dinner_minutes + cls.MEAL_WINDOW + 0.5
+        )
+        if bounds[0] < 0 or bounds[-1] > 24 * 60 or list(bounds) != sorted(bounds):
+            return None
+        return bounds
+
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def to_minutes(time_str: str) -> int:
+        """將 HH:MM 時間字串轉換為當天的分鐘數
+
+        委派給 TripValidator.time_to_minutes，直接拆解字串計算，
+        不經過 datetime.strptime，適合在規劃迴圈等大量呼叫的地方使用。
+        一天只有 1440 種時間，結果以 lru_cache 快取。
+
+        參數:
+            time_str: HH:MM 格式的時間字串
+
+        回傳:
+            int: 從午夜起算的分鐘數
+
+        使用範例:
+            >>> TimeService.to_minutes("09:30")  # 回傳 570
+        """
+        return TripValidator.time_to_minutes(time_str)
+
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def to_time(time_str: str) -> time:
+        """將 HH:MM 時間字串轉換為 time 物件
+
+        與 to_minutes 相同，不經過 datetime.strptime
+
+        參數:
+            time_str: HH:MM 格式的時間字串
+
+        回傳:
+            time: 對應的 time 物件
+
+        使用範例:
+            >>> TimeService.to_time("09:30")  # 回傳 time(9, 30)
+        """
+        return time(*divmod(TimeService.to_minutes(time_str), 60))
+
+    @staticmethod
+    def format_minutes(minutes: int) -> str:
+        """將當天的分鐘數轉換為 HH:MM 時間字串
+
+        參數:
+            minutes: 從午夜起算的分鐘數
+
+        回傳:
+            str: HH:MM 格式的時間字串
+
+        使用範例:
+            >>> TimeService.format_minutes(570)  # 回傳 "09:30"
+        """
+        hour, minute = divmod(minutes, 60)
+        return f"{hour:02d}:{minute:02d}"
+
+    @staticmethod
+    def parse_trip_date(date_str: str, today: Optional[datetime] = None) -> datetime:
+        """將 MM-DD 出發日期轉換為最近一次出現的日期
+
+        今天或之後最早符合的日期，例如 2 月 29 日會找到下一個閏年。
+
+        參數:
+            date_str: MM-DD 格式的日期字串
+            today: 基準日期，預設為今天
+
+        回傳:
+            datetime: 出發日期（時間為午夜）
+
+        使用範例:
+            >>> TimeService.parse_trip_date("12-25").isoweekday()
+        """
+        today = (today or datetime.now()).replace(
+            hour=0, minute=0, second=0, microsecond=0)
+
+        for year in range(today.year, today.year + 5):
+            try:
+                trip_date = datetime.strptime(f"{year}-{date_str}", "%Y-%m-%d")
+            except ValueError:
+                continue
+            if trip_date >= today:
+                return trip_date
+
+        raise ValueError(f"無效的日期: {date_str}")
+
     def _parse_time(self, time_str: str) -> Optional[time]:
         """解析時間字串為 time 物件
 
@@ -175,6 +293,9 @@ class TimeService:
             >>> time_service.validate_time_string("09:30")  # 回傳 True
             >>> time_service.validate_time_string("25:00")  # 回傳 False
             >>> time_service.validate_time_string("none")   # 回傳 True
+
+        與 TripValidator.validate_time_string 不同，小時與分鐘可以是一位數
+        （如 "9:30"），保留原本 strptime 的寬鬆規則
         """
         if time_str == "none":
             return True
@@ -207,8 +328,8 @@ class TimeService:
         if not all(self.validate_time_string(t) for t in [start_time, end_time]):
             return False
 
-        start = datetime.strptime(start_time, self.TIME_FORMAT).time()
-        end = datetime.strptime(end_time, self.TIME_FORMAT).time()
+        start = self.to_minutes(start_time)
+        end = self.to_minutes(end_time)
 
         if allow_overnight:
             return True  # 允許跨日的情況都視為有效
@@ -241,12 +362,20 @@ class TimeService:
         """
         # 統一轉換為 time 物件
         if isinstance(check_time, str):
-            time_obj = datetime.strptime(check_time, self.TIME_FORMAT).time()
+            time_obj = self.to_time(check_time)
         elif isinstance(check_time, datetime):
             time_obj = check_time.time()
         else:
             time_obj = check_time
 
+        # 一般的用餐時間以分界二分搜尋，不必再做 time 物件的加減與比較
+        if self._period_bounds is not None:
+            minutes = time_obj.hour * 60 + time_obj.minute
+            if time_obj.second or time_obj.microsecond:
+                # 不足一分鐘的部分介於兩個整數分鐘之間
+                minutes += 0.5
+            return self.PERIODS[bisect_right(self._period_bounds, minutes)]
+
         # 根據用餐時間判斷時段
         if self.lunch_time:
             lunch_start = self._add_minutes_to_time(
@@ -333,7 +462,8 @@ class TimeService:
         """
         # 轉換時間格式
         if isinstance(current_time, str):
-            current_dt = datetime.strptime(current_time, self.TIME_FORMAT)
+            current_dt = datetime.combine(
+                datetime(1900, 1, 1), self.to_time(current_time))
         else:
             current_dt = current_time
 
@@ -351,8 +481,8 @@ class TimeService:
             if slot is None:
                 continue
 
-            start = datetime.strptime(slot['start'], self.TIME_FORMAT).time()
-            end = datetime.strptime(slot['end'], self.TIME_FORMAT).time()
+            start = self.to_time(slot['start'])
+            end = self.to_time(slot['end'])
 
             # 處理跨日營業的情況
             is_overnight = end < start
@@ -522,7 +652,8 @@ class TimeService:
         """
         # 統一時間格式
         if isinstance(current_time, str):
-            current_dt = datetime.strptime(current_time, self.TIME_FORMAT)
+            current_dt = datetime.combine(
+                datetime(1900, 1, 1), self.to_time(current_time))
         else:
             current_dt = current_time
 
@@ -545,10 +676,8 @@ class TimeService:
                 if slot is None:
                     continue
 
-                start_time = datetime.strptime(
-                    slot['start'], self.TIME_FORMAT).time()
-                end_time = datetime.strptime(
-                    slot['end'], self.TIME_FORMAT).time()
+                start_time = self.to_time(slot['start'])
+                end_time = self.to_time(slot['end'])
 
                 # 如果是當天，需要考慮現在的時間
                 if day_offset == 0:
@@ -3,10 +3,14 @@
 from .validator import TripValidator
 from .navigation_translator import NavigationTranslator
 from .cache_decorator import cached, geo_cache
+from .cheap_ruler import CheapRuler
+from .distance_matrix import DistanceMatrix
 
 __all__ = [
     'TripValidator',
     'NavigationTranslator',
     'cached',
-    'geo_cache'
+    'geo_cache',
+    'CheapRuler',
+    'DistanceMatrix'
 ]
@@ -30,21 +30,17 @@ def cached(maxsize: int = 128) -> Callable:
             if key in cache:
                 return cache[key]
 
-            # 執行函數並存入快取
-            try:
-                result = func(*args, **kwargs)
-                cache[key] = result
-
-                # 如果快取太大，移除最舊的項目
-                if len(cache) > maxsize:
-                    oldest_key = next(iter(cache))
-                    del cache[oldest_key]
-
-                return result
-            except Exception as e:
-                # 如果執行出錯，清除快取並重新拋出異常
-                cache.clear()
-                raise e
+            # 執行函數並存入快取，出錯時直接拋出異常，
+            # 失敗的結果不會存入快取，已快取的項目也保持不變
+            result = func(*args, **kwargs)
+            cache[key] = result
+
+            # 如果快取太大，移除最舊的項目
+            if len(cache) > maxsize:
+                oldest_key = next(iter(cache))
+                del cache[oldest_key]
+
+            return result
 
         # 加入清除快取的方法
         wrapper.cache_clear = lambda: cache.clear()
@@ -55,26 +51,42 @@ def cached(maxsize: int = 128) -> Callable:
 def geo_cache(maxsize: int = 256):
     """地理位置專用的快取裝飾器"""
 
-    def make_cache_key(func_args: tuple, func_kwargs: dict) -> str:
+    # 出發時間以 15 分鐘為單位分組，同一組內共用路線結果
+    departure_bucket_minutes = 15
+
+    def make_cache_key(func_args: tuple, func_kwargs: dict):
         """從函數參數建立快取鍵值
 
+        座標、交通方式與出發時間可以用位置參數或關鍵字參數傳入，
+        兩種呼叫方式會得到相同的鍵值。
+        Google Maps 的路線（尤其是大眾運輸）會隨出發時間改變，
+        出發時間依 departure_bucket_minutes 分組後納入鍵值。
+        呼叫端傳入的已算好距離會改變預估路線的結果，也一併納入鍵值
+
         輸入參數:
             func_args: 原始函數的位置參數
             func_kwargs: 原始函數的關鍵字參數
 
         回傳:
-            str: 由座標和交通方式組成的唯一鍵值
+            由座標（取到小數點後六位）、交通方式、出發時間分組和已算好距離組成的 tuple，
+            參數不完整時回傳不會重複的字串（不使用快取）
         """
         try:
-            # 確認是否有足夠的參數（self, origin, destination, ...）
-            if len(func_args) < 3:
+            # 解析座標參數（self, origin, destination, mode, departure_time, distance）
+            origin = (func_args[1] if len(func_args) > 1
+                      else func_kwargs.get('origin'))
+            destination = (func_args[2] if len(func_args) > 2
+                           else func_kwargs.get('destination'))
+            mode = (func_args[3] if len(func_args) > 3
+                    else func_kwargs.get('mode', 'driving'))
+            departure_time = (func_args[4] if len(func_args) > 4
+                              else func_kwargs.get('departure_time'))
+            distance = (func_args[5] if len(func_args) > 5
+                        else func_kwargs.get('distance'))
+
+            if origin is None or destination is None:
                 return f"default_key_{datetime.now().timestamp()}"
 
-            # 解析座標參數
-            origin = func_args[1]
-            destination = func_args[2]
-            mode = func_args[3] if len(func_args) > 3 else 'driving'
-
             # 檢查座標格式
             if not isinstance(origin, dict) or not isinstance(destination, dict):
                 return f"invalid_format_key_{datetime.now().timestamp()}"
@@ -83,12 +95,21 @@ def geo_cache(maxsize: int = 256):
                'lat' not in destination or 'lon' not in destination:
                 return f"missing_coord_key_{datetime.now().timestamp()}"
 
-            # 建立標準化的鍵值
-            key = (f"{float(origin['lat']):.6f},{float(origin['lon']):.6f}_"
-                   f"{float(destination['lat']):.6f},{float(destination['lon']):.6f}_"
-                   f"{mode}")
-
-            return key
+            departure_bucket = None
+            if departure_time is not None:
+                departure_bucket = departure_time.replace(
+                    minute=(departure_time.minute // departure_bucket_minutes
+                            * departure_bucket_minutes),
+                    second=0, microsecond=0)
+
+            # 以 tuple 作為鍵值，雜湊時不必先格式化成字串
+            return (round(float(origin['lat']), 6),
+                    round(float(origin['lon']), 6),
+                    round(float(destination['lat']), 6),
+                    round(float(destination['lon']), 6),
+                    mode,
+                    departure_bucket,
+                    None if distance is None else round(float(distance), 6))
 
         except Exception as e:
             print(f"建立快取鍵值時發生錯誤: {str(e)}")
@@ -105,7 +126,6 @@ def geo_cache(maxsize: int = 256):
 
             # 檢查快取
             if cache_key in cache:
-                print(f"使用快取的路線資訊: {cache_key}")
                 return cache[cache_key]
 
             # 執行原始函數
@@ -0,0 +1,91 @@
+# src/core/utils/cheap_ruler.py
+
+import math
+from typing import Dict, Union
+import numpy as np
+
+
+class CheapRuler:
+    """快速距離近似計算
+
+    在參考緯度預先算好每度經緯度對應的公里數（kx, ky），
+    之後計算距離只需要兩個乘法和一個 hypot，不需要三角函數。
+
+    採用 WGS84 橢球修正，在數百公里內的誤差遠小於 0.1%，
+    比球面 Haversine 公式更適合城市範圍（如台北地區）的行程規劃。
+
+    使用範例:
+        >>> ruler = CheapRuler(25.05)
+        >>> ruler.distance({'lat': 25.0, 'lon': 121.5}, {'lat': 25.1, 'lon': 121.6})
+    """
+
+    # WGS84 橢球參數
+    EQUATORIAL_RADIUS = 6378.137          # 赤道半徑（公里）
+    FLATTENING = 1 / 298.257223563        # 扁率
+    E2 = FLATTENING * (2 - FLATTENING)    # 第一偏心率平方
+
+    def __init__(self, lat0: float):
+        """初始化參考緯度的換算係數
+
+        參數:
+            lat0: 參考緯度（度），建議使用所有地點的平均緯度
+        """
+        self.lat0 = lat0
+
+        mul = math.radians(self.EQUATORIAL_RADIUS)
+        coslat = math.cos(math.radians(lat0))
+        w2 = 1 / (1 - self.E2 * (1 - coslat * coslat))
+        w = math.sqrt(w2)
+
+        # 每度經度、緯度對應的公里數
+        self.kx = mul * w * coslat
+        self.ky = mul * w * w2 * (1 - self.E2)
+
+    def distance(self,
+                 point1: Dict[str, float],
+                 point2: Dict[str, float]) -> float:
+        """計算兩點間的近似距離
+
+        參數:
+            point1: 第一個點的座標 {'lat': float, 'lon': float}
+            point2: 第二個點的座標 {'lat': float, 'lon': float}
+
+        回傳:
+            float: 兩點間的距離（公里）
+        """
+        dx = self._wrap(point1['lon'] - point2['lon']) * self.kx
+        dy = (point1['lat'] - point2['lat']) * self.ky
+        return math.hypot(dx, dy)
+
+    def distance_matrix(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """以向量化方式計算所有點兩兩之間的近似距離
+
+        參數:
+            lat: 所有點的緯度（度）
+            lon: 所有點的經度（度）
+
+        回傳:
+            np.ndarray: N×N 的距離矩陣（公里）
+        """
+        # 先把 N 個點換算成公里再相減，N×N 的部分全部原地運算，
+        # 不配置額外的暫存陣列；距離只有數百公里，不需要 hypot 的溢位保護
+        if np.ptp(lon) > 180:
+            # 跨越 180 度經線時才需要調整經度差
+            dx = np.subtract.outer(lon, lon)
+            dx = self._wrap(dx)
+            dx *= self.kx
+        else:
+            x = lon * self.kx
+            dx = np.subtract.outer(x, x)
+        y = lat * self.ky
+        dy = np.subtract.outer(y, y)
+
+        dx *= dx
+        dy *= dy
+        dx += dy
+        return np.sqrt(dx, out=dx)
+
+    @staticmethod
+    def _wrap(deg: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """將經度差調整到 -180 到 180 度之間"""
+        return (deg + 180) % 360 - 180
@@ -0,0 +1,285 @@
+# src/core/utils/distance_matrix.py
+
+from typing import Any, List, Optional, Tuple
+import numpy as np
+from .cheap_ruler import CheapRuler
+
+
+class DistanceMatrix:
+    """地點間的直線距離矩陣
+
+    在規劃開始前一次算好所有地點兩兩之間的距離，
+    規劃迴圈中只需要查表，不必每次重新計算 Haversine 公式。
+
+    設計考量：
+    - 使用 NumPy 廣播一次算完 N×N 個距離
+    - 預設使用 CheapRuler 近似公式，省去三角函數運算
+    - 以 float32 儲存，減少記憶體用量
+    - 以物件 id 建立索引，地點名稱重複也不會衝突
+    - 設定距離上限時，超出上限的組合記為無限大（無法到達）；
+      Haversine 公式先以經緯度差做邊界框篩選，框外的組合不計算三角函數
+    """
+
+    # 地球半徑（公里），與 GeoService 相同
+    EARTH_RADIUS = 6371.0087714
+
+    # 每度緯度對應的最短距離（公里），用於邊界框篩選，
+    # 取略小的值讓邊界框偏寬，不會誤排除上限內的地點
+    KM_PER_DEG_LAT = 110.5
+
+    def __init__(self,
+                 places: List[Any],
+                 use_haversine: bool = False,
+                 speed_kmh: Optional[float] = None,
+                 time_factor: float = 1.0,
+                 max_distance: Optional[float] = None):
+        """建立距離矩陣
+
+        輸入參數:
+            places: List[PlaceDetail] - 要納入矩陣的地點（需有 lat/lon 屬性）
+            use_haversine: bool - 是否改用 Haversine 公式（用於驗證正確性）
+            speed_kmh: Optional[float] - 移動速度（公里/小時），
+                       有設定時一併算出預估交通時間矩陣
+            time_factor: float - 交通時間的修正係數（路線曲折、紅綠燈等）
+            max_distance: Optional[float] - 距離上限（公里），
+                          超出上限的組合記為 inf
+        """
+        # 保留地點參考，確保 id 在矩陣存活期間不會被重複使用
+        self.places = list(places)
+        self._index = {id(place): i for i, place in enumerate(self.places)}
+
+        lat, lon = self.coordinates(self.places)
+
+        if use_haversine or not self.places:
+            if max_distance is None or not self.places:
+                distances = self.haversine_matrix(lat, lon)
+            else:
+                # 只對邊界框內的組合計算三角函數
+                in_range = self.bounding_box_mask(lat, lon, max_distance)
+                distances = np.full((len(lat), len(lat)), np.inf)
+                i, j = np.nonzero(in_range)
+                distances[i, j] = self.haversine(lat[i], lon[i], lat[j], lon[j])
+        else:
+            # 以所有地點的平均緯度作為參考緯度。
+            # CheapRuler 每個組合只需要乘加與開根號，邊界框篩選省不了多少計算，
+            # 直接算完整矩陣後把超出上限的組合記為 inf
+            ruler = CheapRuler(float(lat.mean()))
+            distances = ruler.distance_matrix(lat, lon)
+            if max_distance is not None:
+                distances[distances > max_distance] = np.inf
+
+        self.distances = distances.astype(np.float32)
+
+        # 預估交通時間（分鐘），同一次廣播運算中由距離換算
+        self.travel_minutes = None
+        if speed_kmh:
+            self.travel_minutes = (
+                distances * (60.0 * time_factor / speed_kmh)
+            ).astype(np.float32)
+
+    @staticmethod
+    def coordinates(places: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """取出所有地點的緯度與經度陣列
+
+        參數:
+            places: 地點列表（需有 lat/lon 屬性）
+
+        回傳:
+            Tuple[np.ndarray, np.ndarray]: (緯度, 經度)，皆為 float64
+        """
+        n = len(places)
+        lat = np.fromiter((place.lat for place in places), dtype=np.float64, count=n)
+        lon = np.fromiter((place.lon for place in places), dtype=np.float64, count=n)
+        return lat, lon
+
+    @classmethod
+    def haversine_matrix(cls, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """以向量化的 Haversine 公式計算距離矩陣
+
+        參數:
+            lat: 所有點的緯度（度）
+            lon: 所有點的經度（度）
+
+        回傳:
+            np.ndarray: N×N 的距離矩陣（公里）
+        """
+        # 三角函數只對 N 個點計算一次，N×N 的部分全部原地運算，
+        # 避免每一步都配置新的 N×N 暫存陣列
+        phi = np.radians(lat)
+        lam = np.radians(lon)
+        cos_phi = np.cos(phi)
+
+        a = np.subtract.outer(phi, phi)
+        a *= 0.5
+        np.sin(a, out=a)
+        a *= a
+
+        b = np.subtract.outer(lam, lam)
+        b *= 0.5
+        np.sin(b, out=b)
+        b *= b
+        b *= cos_phi[:, None]
+        b *= cos_phi[None, :]
+
+        a += b
+        np.sqrt(a, out=a)
+        np.arcsin(a, out=a)
+        a *= 2 * cls.EARTH_RADIUS
+        return a
+
+    @classmethod
+    def haversine(cls,
+                  lat1: np.ndarray,
+                  lon1: np.ndarray,
+                  lat2: np.ndarray,
+                  lon2: np.ndarray) -> np.ndarray:
+        """以 Haversine 公式逐對計算距離，支援 NumPy 廣播
+
+        參數:
+            lat1, lon1: 起點緯度、經度（度）
+            lat2, lon2: 終點緯度、經度（度）
+
+        回傳:
+            np.ndarray: 距離（公里）
+        """
+        lat1 = np.radians(lat1)
+        lat2 = np.radians(lat2)
+        dlat = lat1 - lat2
+        dlon = np.radians(lon1) - np.radians(lon2)
+
+        a = (np.sin(dlat / 2) ** 2 +
+             np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2)
+
+        return 2 * cls.EARTH_RADIUS * np.arcsin(np.sqrt(a))
+
+    @classmethod
+    def bounding_box_mask(cls,
+                          lat: np.ndarray,
+                          lon: np.ndarray,
+                          max_distance: float) -> np.ndarray:
+        """以經緯度差篩選可能在距離上限內的組合
+
+        只需要減法與比較，不需要三角函數。
+        經度方向以最高緯度換算，確保邊界框不會比實際範圍小。
+
+        參數:
+            lat: 所有點的緯度（度）
+            lon: 所有點的經度（度）
+            max_distance: 距離上限（公里）
+
+        回傳:
+            np.ndarray: N×N 的布林矩陣，False 表示一定超出上限
+        """
+        max_dlat, max_dlon = cls._box_size(np.abs(lat).max(), max_distance)
+
+        dlat = np.abs(lat[:, None] - lat[None, :])
+        dlon = np.abs(lon[:, None] - lon[None, :])
+        dlon = np.minimum(dlon, 360 - dlon)
+
+        return (dlat <= max_dlat) & (dlon <= max_dlon)
+
+    @classmethod
+    def bounding_box_row(cls,
+                         lat0: float,
+                         lon0: float,
+                         lat: np.ndarray,
+                         lon: np.ndarray,
+                         max_distance: float) -> np.ndarray:
+        """以經緯度差篩選可能在起點距離上限內的地點
+
+        與 bounding_box_mask 相同的邊界框，只計算單一起點的一列
+
+        參數:
+            lat0, lon0: 起點緯度、經度（度）
+            lat: 所有地點的緯度（度）
+            lon: 所有地點的經度（度）
+            max_distance: 距離上限（公里）
+
+        回傳:
+            np.ndarray: 長度 N 的布林陣列，False 表示一定超出上限
+        """
+        if len(lat) == 0:
+            return np.zeros(0, dtype=bool)
+
+        max_dlat, max_dlon = cls._box_size(
+            max(abs(lat0), np.abs(lat).max()), max_distance)
+
+        dlon = np.abs(lon - lon0)
+        dlon = np.minimum(dlon, 360 - dlon)
+
+        return (np.abs(lat - lat0) <= max_dlat) & (dlon <= max_dlon)
+
+    @classmethod
+    def _box_size(cls, max_abs_lat: float, max_distance: float) -> Tuple[float, float]:
+        """計算邊界框的緯度差與經度差上限
+
+        經度方向以最高緯度換算，確保邊界框不會比實際範圍小
+
+        參數:
+            max_abs_lat: 所有點中最大的緯度絕對值（度）
+            max_distance: 距離上限（公里）
+
+        回傳:
+            Tuple[float, float]: (緯度差上限, 經度差上限)，單位為度
+        """
+        max_dlat = max_distance / cls.KM_PER_DEG_LAT
+        cos_lat = max(np.cos(np.radians(max_abs_lat)), 1e-6)
+        return max_dlat, max_dlat / cos_lat
+
+    def index_of(self, place: Any) -> Optional[int]:
+        """取得地點在矩陣中的索引，不在矩陣中則回傳 None"""
+        return self._index.get(id(place))
+
+    def indices_of(self, places: List[Any]) -> Optional[np.ndarray]:
+        """一次取得多個地點在矩陣中的索引
+
+        參數:
+            places: 地點列表
+
+        回傳:
+            Optional[np.ndarray]: 索引陣列，任一地點不在矩陣中則回傳 None
+        """
+        index = self._index
+        indices = [index.get(id(place)) for place in places]
+        if None in indices:
+            return None
+        return np.array(indices, dtype=np.intp)
+
+    def distance(self, origin: Any, destination: Any) -> Optional[float]:
+        """查詢兩個地點間的距離
+
+        參數:
+            origin: 起點
+            destination: 終點
+
+        回傳:
+            Optional[float]: 距離（公里），任一地點不在矩陣中則回傳 None，
+                             超出距離上限則回傳 inf
+        """
+        i = self.index_of(origin)
+        j = self.index_of(destination)
+        if i is None or j is None:
+            return None
+        return float(self.distances[i, j])
+
+    def travel_time(self, origin: Any, destination: Any) -> Optional[float]:
+        """查詢兩個地點間的預估交通時間
+
+        參數:
+            origin: 起點
+            destination: 終點
+
+        回傳:
+            Optional[float]: 交通時間（分鐘），
+                             未設定速度或地點不在矩陣中則回傳 None
+        """
+        if self.travel_minutes is None:
+            return None
+        i = self.index_of(origin)
+        j = self.index_of(destination)
+        if i is None or j is None:
+            return None
+        return float(self.travel_minutes[i, j])
+
+    def __len__(self) -> int:
+        return len(self.places)
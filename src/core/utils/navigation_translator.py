@@ -12,6 +12,11 @@ from typing import Dict
 import re
 
 
+# 清理導航文字用的正規表示式，每個導航步驟都會用到，預先編譯
+_HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
 class NavigationTranslator:
     """導航文字轉換類別"""
 
@@ -56,9 +61,9 @@ class NavigationTranslator:
             str: 清理後的純文字
         """
         # 移除所有HTML標籤
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _HTML_TAG_PATTERN.sub('', text)
         # 移除多餘的空格
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_PATTERN.sub(' ', text)
         return text.strip()
 
     @classmethod
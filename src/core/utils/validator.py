@@ -5,8 +5,12 @@ from typing import List, Dict, Optional, Union
 import re
 
 
-class ValidationError(Exception):
-    """驗證錯誤的基礎類別"""
+class ValidationError(ValueError):
+    """驗證錯誤的基礎類別
+
+    繼承 ValueError，在 pydantic 的 field_validator 中直接拋出時
+    會被轉換為一般的欄位驗證錯誤，不需要另外包裝
+    """
 
     def __init__(self, message: str, field: str = None):
         self.message = message
@@ -18,13 +22,21 @@ class TripValidator:
     """行程驗證器"""
 
     # 常數定義
-    VALID_TRANSPORT_MODES = {"transit", "driving", "walking", "bicycling"}
+    VALID_TRANSPORT_MODES = frozenset(
+        {"transit", "driving", "walking", "bicycling"})
+    VALID_PERIODS = frozenset(
+        {'morning', 'lunch', 'afternoon', 'dinner', 'night'})
     DEFAULT_HOURS = {i: [{'start': '00:00', 'end': '23:59'}]
                      for i in range(1, 8)}
-    REQUIRED_PLACE_FIELDS = {'name', 'lat',
-                             'lon', 'duration', 'label', 'period'}
+    REQUIRED_PLACE_FIELDS = frozenset({'name', 'lat',
+                                       'lon', 'duration', 'label', 'period'})
+    REQUIRED_REQUIREMENT_FIELDS = frozenset({
+        'start_time', 'end_time', 'start_point', 'transport_mode',
+        'distance_threshold'
+    })
     TIME_PATTERN = r'^([01][0-9]|2[0-3]):[0-5][0-9]$'
     DATE_PATTERN = r'^(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])$'
+    DATE_RE = re.compile(DATE_PATTERN)  # 預先編譯，避免每次比對都查詢 re 的快取
 
     @classmethod
     def validate_coordinates(cls, lat: float, lon: float) -> bool:
@@ -69,7 +81,30 @@ class TripValidator:
         """
         if time_str == "none":
             return True
-        return bool(re.match(cls.TIME_PATTERN, time_str))
+
+        # 逐字元檢查，比正規表示式或 strptime 快
+        if (not isinstance(time_str, str) or len(time_str) != 5
+                or time_str[2] != ':'):
+            return False
+        hour, minute = time_str[:2], time_str[3:]
+        # 只接受 ASCII 數字，isdigit() 會接受全形數字與上標等字元
+        if not all('0' <= c <= '9' for c in hour + minute):
+            return False
+        return int(hour) < 24 and int(minute) < 60
+
+    @staticmethod
+    def time_to_minutes(time_str: str) -> int:
+        """將 HH:MM 字串轉換為當天的分鐘數
+
+        整個專案共用的時間解析方法（TimeService.to_minutes 也委派給這裡），
+        以冒號拆開，小時與分鐘不限兩位數（"9:30" 也可以解析）
+
+        使用範例:
+            >>> TripValidator.time_to_minutes("09:30")
+            570
+        """
+        hour, minute = time_str.split(':')
+        return int(hour) * 60 + int(minute)
 
     @classmethod
     def validate_date_string(cls, date_str: str) -> bool:
@@ -92,7 +127,7 @@ class TripValidator:
         """
         if date_str == "none":
             return True
-        return bool(re.match(cls.DATE_PATTERN, date_str))
+        return cls.DATE_RE.match(date_str) is not None
 
     @classmethod
     def validate_time_range(cls, start_time: str, end_time: str) -> bool:
@@ -114,8 +149,8 @@ class TripValidator:
         if not all([cls.validate_time_string(t) for t in [start_time, end_time]]):
             return False
 
-        start = datetime.strptime(start_time, '%H:%M').time()
-        end = datetime.strptime(end_time, '%H:%M').time()
+        start = cls.time_to_minutes(start_time)
+        end = cls.time_to_minutes(end_time)
 
         # 允許跨日營業時間(如夜市)
         if end < start:
@@ -150,10 +185,10 @@ class TripValidator:
                 }
             >>> TripValidator.validate_place(place)
         """
-        # 檢查必要欄位
-        missing = cls.REQUIRED_PLACE_FIELDS - set(place_data.keys())
-        if missing:
-            raise ValidationError(f"缺少必要欄位：{missing}")
+        # 檢查必要欄位（欄位齊全時只需一次集合比較）
+        if not place_data.keys() >= cls.REQUIRED_PLACE_FIELDS:
+            missing = cls.REQUIRED_PLACE_FIELDS - place_data.keys()
+            raise ValidationError(f"缺少必要欄位：{set(missing)}")
 
         # 驗證座標
         if not cls.validate_coordinates(place_data['lat'], place_data['lon']):
@@ -168,9 +203,7 @@ class TripValidator:
             raise ValidationError("停留時間必須為整數", "duration")
 
         # 驗證時段標記
-        valid_periods = {'morning', 'lunch',
-                         'afternoon', 'dinner', 'night'}
-        if place_data['period'] not in valid_periods:
+        if place_data['period'] not in cls.VALID_PERIODS:
             raise ValidationError(
                 f"無效的時段標記：{place_data['period']}", "period")
 
@@ -279,21 +312,17 @@ class TripValidator:
             >>> TripValidator.validate_trip_requirement(req)
         """
         # 檢查必要欄位
-        required_fields = {
-            'start_time', 'end_time', 'start_point', 'transport_mode',
-            'distance_threshold'
-        }
-        missing = required_fields - set(requirement.keys())
-        if missing:
-            raise ValidationError(f"缺少必要欄位：{missing}")
+        if not requirement.keys() >= cls.REQUIRED_REQUIREMENT_FIELDS:
+            missing = cls.REQUIRED_REQUIREMENT_FIELDS - requirement.keys()
+            raise ValidationError(f"缺少必要欄位：{set(missing)}")
 
         # 驗證時間格式和順序
         for key in ['start_time', 'end_time']:
             if not cls.validate_time_string(requirement[key]):
                 raise ValidationError(f"時間格式錯誤：{requirement[key]}", key)
 
-        start = datetime.strptime(requirement['start_time'], '%H:%M')
-        end = datetime.strptime(requirement['end_time'], '%H:%M')
+        start = cls.time_to_minutes(requirement['start_time'])
+        end = cls.time_to_minutes(requirement['end_time'])
         if start >= end:
             raise ValidationError("結束時間必須晚於開始時間", "time_range")
 
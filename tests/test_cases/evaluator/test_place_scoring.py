@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from src.core.evaluator.place_scoring import PlaceScoring
+from src.core.models.place import PlaceDetail
+from src.core.models.place_arrays import PlaceArrays
+from src.core.services.geo_service import GeoService
+from src.core.services.time_service import TimeService
+
+
+def test_business_hours_fit():
+    """測試依距離打烊的剩餘時間評分，包含跨日營業"""
+    scoring = PlaceScoring(TimeService(), GeoService())
+    place = PlaceDetail(
+        name="夜市",
+        lat=25.0,
+        lon=121.5,
+        duration=60,
+        label="小吃",
+        period="night",
+        hours={1: [{'start': '17:00', 'end': '01:00'}]}
+    )
+
+    # 2024-01-01 為星期一
+    assert scoring._evaluate_business_hours_fit(
+        place, datetime(2024, 1, 1, 18, 0)) == 1.0
+    assert scoring._evaluate_business_hours_fit(
+        place, datetime(2024, 1, 1, 23, 50)) == 0.5
+    assert scoring._evaluate_business_hours_fit(
+        place, datetime(2024, 1, 1, 12, 0)) == 0.0
+
+
+def test_time_slot_base_score():
+    """測試時段適合度依目前時段與建議時段的差距遞減"""
+    scoring = PlaceScoring(TimeService(), GeoService())
+    place = PlaceDetail(
+        name="博物館",
+        lat=25.0,
+        lon=121.5,
+        duration=60,
+        label="景點",
+        period="morning",
+        hours={1: [{'start': '00:00', 'end': '23:59'}]}
+    )
+
+    # 時間充足時只受時段差距影響：morning、lunch、afternoon、dinner、night
+    scores = [
+        scoring._calculate_time_slot_score(place, datetime(2024, 1, 1, hour, 0))
+        for hour in (9, 12, 15, 18, 21)
+    ]
+    assert scores == pytest.approx([1.0, 0.8, 0.6, 0.4, 0.3])
+
+
+def test_calculate_scores_matches_calculate_score():
+    """測試向量化評分與逐一評分的結果相同，涵蓋每個星期與跨日營業"""
+    scoring = PlaceScoring(TimeService(), GeoService())
+    places = [
+        PlaceDetail(name="博物館", rating=4.8, lat=25.1023, lon=121.5482,
+                    duration=120, label="景點", period="morning",
+                    hours={day: [{'start': '09:00', 'end': '17:00'}]
+                           for day in range(1, 6)}),
+        PlaceDetail(name="夜市", rating=4.2, lat=25.0, lon=121.5,
+                    duration=60, label="小吃", period="night",
+                    hours={1: [{'start': '17:00', 'end': '01:00'}],
+                           5: [{'start': '18:00', 'end': '02:00'}],
+                           6: [{'start': '18:00', 'end': '02:00'}]}),
+        PlaceDetail(name="咖啡廳", lat=25.04, lon=121.55,
+                    duration=60, label="咖啡廳", period="afternoon",
+                    hours={day: [{'start': '08:00', 'end': '12:00'},
+                                 {'start': '13:00', 'end': '20:00'}]
+                           for day in (1, 3, 6, 7)}),
+    ]
+    current = PlaceDetail(name="台北車站", lat=25.0478, lon=121.5170,
+                          duration=0, label="交通", period="morning",
+                          hours={1: [None]})
+    arrays = PlaceArrays.from_places(places)
+    indices = np.arange(len(places))
+    travel_times = np.array([0.0, 15.0, 40.0])
+
+    # 2024-01-01 至 01-07 為星期一至星期日；
+    # 星期六、日凌晨會遇到前一天開始的跨日營業時段
+    for day in range(1, 8):
+        for hour in (0, 1, 8, 10, 13, 16, 19, 23):
+            current_time = datetime(2024, 1, day, hour, 30)
+            expected = [
+                scoring.calculate_score(place, current, current_time, travel_time)
+                for place, travel_time in zip(places, travel_times.tolist())
+            ]
+            scores = scoring.calculate_scores(
+                places, current, current_time, travel_times, arrays, indices)
+            assert scores.tolist() == expected
+
+
+def test_calculate_score_with_precomputed_distance():
+    """測試傳入已算好的距離時沿用該距離，不重新計算"""
+    scoring = PlaceScoring(TimeService(), GeoService())
+    place = PlaceDetail(name="博物館", rating=4.0, lat=25.1023, lon=121.5482,
+                        duration=120, label="景點", period="morning",
+                        hours={1: [{'start': '09:00', 'end': '17:00'}]})
+    current = PlaceDetail(name="台北車站", lat=25.0478, lon=121.5170,
+                          duration=0, label="交通", period="morning",
+                          hours={1: [None]})
+    current_time = datetime(2024, 1, 1, 10, 0)
+
+    # 景點可接受 36 公里，18 公里時距離分數為 0.5
+    assert scoring._calculate_distance_score(place, current, 18.0) == 0.5
+    assert scoring._calculate_distance_score(place, current) == pytest.approx(
+        1.0 - GeoService.calculate_distance(
+            {'lat': current.lat, 'lon': current.lon},
+            {'lat': place.lat, 'lon': place.lon}) / 36.0)
+
+    scores = scoring.calculate_scores(
+        [place], current, current_time, np.array([20.0]),
+        PlaceArrays.from_places([place]), np.array([0]), np.array([18.0]))
+    assert scores.tolist() == [scoring.calculate_score(
+        place, current, current_time, 20.0, distance=18.0)]
@@ -1,4 +1,5 @@
 import pytest
+from pydantic import ValidationError as PydanticValidationError
 from src.core.models.place import PlaceDetail
 
 
@@ -58,3 +59,143 @@ def test_place_detail_creation():
     )
     assert place4.duration == 60  # 預設60分鐘
     assert place4.duration_min == 60
+
+
+def test_place_detail_hours_min():
+    """測試營業時間預先轉換為分鐘數，並用於營業判斷"""
+    place = PlaceDetail(
+        name="夜市",
+        lat=25.0,
+        lon=121.5,
+        label="小吃",
+        period="night",
+        hours={
+            1: [{'start': '11:00', 'end': '14:00'},
+                {'start': '17:00', 'end': '02:00'}],
+            2: [None]
+        }
+    )
+    assert place.hours_min == {1: [(660, 840), (1020, 120)], 2: []}
+
+    assert place.is_open_at(1, "12:30")
+    assert not place.is_open_at(1, "15:00")
+    assert place.is_open_at(1, "23:30")   # 跨日營業
+    assert place.is_open_at(1, "01:30")
+    assert not place.is_open_at(2, "12:30")
+    assert not place.is_open_at(3, "12:30")
+
+
+def test_place_detail_is_frozen():
+    """測試地點物件建立後不可修改"""
+    place = PlaceDetail(
+        name="台北101",
+        lat=25.0339,
+        lon=121.5619,
+        label="景點",
+        period="morning",
+        hours={1: [{'start': '09:00', 'end': '17:00'}]}
+    )
+    with pytest.raises(ValueError):
+        place.duration_min = 30
+
+
+def test_place_detail_calculate_distance():
+    """測試地點間距離計算，支援 PlaceDetail 與座標字典"""
+    place1 = PlaceDetail(
+        name="台北車站",
+        lat=25.0478,
+        lon=121.5170,
+        label="景點",
+        period="morning",
+        hours={1: [{'start': '09:00', 'end': '17:00'}]}
+    )
+    place2 = PlaceDetail(
+        name="台北101",
+        lat=25.0339808,
+        lon=121.561964,
+        label="景點",
+        period="morning",
+        hours={1: [{'start': '09:00', 'end': '17:00'}]}
+    )
+
+    assert place1.calculate_distance(place2) == pytest.approx(4.8, abs=0.1)
+    assert place1.calculate_distance(
+        {'lat': place2.lat, 'lon': place2.lon}) == place1.calculate_distance(place2)
+
+
+def test_place_detail_does_not_mutate_input():
+    """測試建立地點不會改動輸入的字典，model_validate 也會補上 duration_min"""
+    data = {
+        "name": "台北101",
+        "lat": 25.0339,
+        "lon": 121.5619,
+        "duration": 90,
+        "label": "景點",
+        "period": "morning",
+        "hours": {1: [{'start': '09:00', 'end': '17:00'}]}
+    }
+    original = dict(data)
+
+    place = PlaceDetail.model_validate(data)
+    assert place.duration_min == 90
+    assert PlaceDetail(**data).duration_min == 90
+    assert data == original
+
+    # 兩個欄位已一致的資料（如 model_dump 結果）可以直接重建
+    assert PlaceDetail(**place.model_dump()) == place
+
+
+def test_place_detail_invalid_hours():
+    """測試營業時間格式錯誤時拋出 pydantic 的驗證錯誤"""
+    with pytest.raises(PydanticValidationError, match="時段缺少end時間"):
+        PlaceDetail(
+            name="台北101",
+            lat=25.0339,
+            lon=121.5619,
+            label="景點",
+            period="morning",
+            hours={1: [{'start': '09:00'}]}
+        )
+
+
+def test_place_detail_is_open_at_minutes():
+    """測試以分鐘數檢查營業狀態，與字串版本結果一致"""
+    place = PlaceDetail(
+        name="夜市",
+        lat=25.0,
+        lon=121.5,
+        label="小吃",
+        period="night",
+        hours={1: [{'start': '17:00', 'end': '02:00'}], 2: [None]}
+    )
+
+    assert place.is_open_at_minutes(1, 18 * 60)
+    assert place.is_open_at_minutes(1, 60)
+    assert not place.is_open_at_minutes(1, 12 * 60)
+    assert not place.is_open_at_minutes(2, 18 * 60)
+    assert place.is_open_at(1, "18:00") == place.is_open_at_minutes(1, 18 * 60)
+
+
+def test_place_detail_bulk_from():
+    """測試整批轉換地點資料，已轉換的物件直接沿用"""
+    data = {
+        "name": "台北101",
+        "lat": 25.0339,
+        "lon": 121.5619,
+        "duration": 90,
+        "label": "景點",
+        "period": "morning",
+        "hours": {1: [{'start': '09:00', 'end': '17:00'}]}
+    }
+    places = PlaceDetail.bulk_from([data, {**data, "name": "象山"}])
+    assert [place.name for place in places] == ["台北101", "象山"]
+    assert places[0] == PlaceDetail(**data)
+
+    # 已轉換的物件與混合列表
+    assert PlaceDetail.bulk_from(places)[1] is places[1]
+    mixed = PlaceDetail.bulk_from([places[0], data])
+    assert mixed[0] is places[0]
+    assert mixed[1].duration_min == 90
+
+    with pytest.raises(PydanticValidationError):
+        PlaceDetail.bulk_from([{**data, "period": "noon"}])
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+from src.core.models.place import PlaceDetail
+from src.core.models.place_arrays import PlaceArrays, PERIOD_CODES
+
+
+def test_place_arrays_from_places():
+    """測試 PlaceDetail 列表轉換為欄位式陣列"""
+    places = [
+        PlaceDetail(
+            name="台北101",
+            rating=4.5,
+            lat=25.0339,
+            lon=121.5619,
+            duration=90,
+            label="景點",
+            period="morning",
+            hours={1: [{'start': '09:00', 'end': '17:00'}]}
+        ),
+        PlaceDetail(
+            name="鼎泰豐",
+            rating=4.8,
+            lat=25.0329,
+            lon=121.5604,
+            label="餐廳",
+            period="lunch",
+            hours={
+                1: [
+                    {'start': '11:30', 'end': '14:30'},
+                    {'start': '17:30', 'end': '21:30'}
+                ],
+                2: [None]
+            }
+        ),
+    ]
+    arrays = PlaceArrays.from_places(places)
+
+    assert len(arrays) == 2
+    assert arrays.index_of(places[1]) == 1
+    assert arrays.duration.tolist() == [90, 90]
+    assert arrays.period.tolist() == [
+        PERIOD_CODES['morning'], PERIOD_CODES['lunch']]
+    assert arrays.rating[1] == pytest.approx(4.8)
+
+    # 營業時間以分鐘數儲存，形狀為 (N, 7, K, 2)
+    assert arrays.hours.shape == (2, 7, 2, 2)
+    assert arrays.hours[0, 0, 0].tolist() == [540, 1020]
+    assert arrays.hours[1, 0, 1].tolist() == [1050, 1290]
+
+    # 未營業的日子與時段保持 -1
+    assert arrays.hours[0, 0, 1].tolist() == [-1, -1]
+    assert arrays.hours[1, 1].tolist() == [[-1, -1], [-1, -1]]
+
+
+def test_place_arrays_is_open_batch():
+    """測試向量化的營業狀態查詢，包含跨日營業"""
+    places = [
+        PlaceDetail(
+            name="博物館",
+            lat=25.1,
+            lon=121.5,
+            label="景點",
+            period="morning",
+            hours={1: [{'start': '09:00', 'end': '17:00'}]}
+        ),
+        PlaceDetail(
+            name="夜市",
+            lat=25.0,
+            lon=121.5,
+            label="小吃",
+            period="night",
+            hours={1: [{'start': '17:00', 'end': '02:00'}]}
+        ),
+    ]
+    arrays = PlaceArrays.from_places(places)
+    indices = np.arange(len(arrays))
+
+    assert arrays.is_open_batch(indices, 1, 600).tolist() == [True, False]
+    assert arrays.is_open_batch(indices, 1, 1200).tolist() == [False, True]
+    assert arrays.is_open_batch(indices, 1, 60).tolist() == [False, True]
+    assert arrays.is_open_batch(indices, 2, 600).tolist() == [False, False]
+
+    # 與逐一檢查的結果一致
+    for minutes in range(0, 24 * 60, 30):
+        time_str = f"{minutes // 60:02d}:{minutes % 60:02d}"
+        expected = [place.is_open_at(1, time_str) for place in places]
+        assert arrays.is_open_batch(indices, 1, minutes).tolist() == expected
+
+
+def test_place_arrays_for_day():
+    """測試取出單日營業區間並快取"""
+    place = PlaceDetail(
+        name="博物館",
+        lat=25.1,
+        lon=121.5,
+        label="景點",
+        period="morning",
+        hours={3: [{'start': '09:00', 'end': '17:00'}]}
+    )
+    arrays = PlaceArrays.from_places([place])
+    starts, ends = arrays.for_day(3)
+
+    assert starts.flags['C_CONTIGUOUS']
+    assert starts.tolist() == [[540]]
+    assert ends.tolist() == [[1020]]
+    assert arrays.for_day(3)[0] is starts
+
+
+def test_place_arrays_indices_of():
+    """測試一次查詢多個地點的索引，不存在的地點回傳 None"""
+    places = [
+        PlaceDetail(
+            name=name,
+            lat=25.0,
+            lon=121.5,
+            label="景點",
+            period="morning",
+            hours={1: [{'start': '09:00', 'end': '17:00'}]}
+        )
+        for name in ("博物館", "公園", "老街")
+    ]
+    arrays = PlaceArrays.from_places(places[:2])
+
+    assert arrays.indices_of([places[1], places[0]]).tolist() == [1, 0]
+    assert arrays.indices_of(places) is None
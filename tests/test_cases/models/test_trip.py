@@ -0,0 +1,22 @@
+from src.core.models.trip import TripRequirement
+
+
+def test_get_meal_times():
+    """測試用餐時段為設定時間起算一小時，跳過未設定的餐別"""
+    requirement = TripRequirement(
+        start_time="09:00",
+        end_time="18:00",
+        start_point="台北車站",
+        end_point="none",
+        transport_mode="driving",
+        distance_threshold=30,
+        breakfast_time="none",
+        lunch_time="12:30",
+        dinner_time="18:00",
+        budget="none",
+        date="none"
+    )
+    meal_times = requirement.get_meal_times()
+
+    assert [(slot.start_time, slot.end_time) for slot in meal_times] == [
+        ("12:30", "13:30"), ("18:00", "19:00")]
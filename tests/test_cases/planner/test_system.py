@@ -0,0 +1,401 @@
+import pytest
+from datetime import datetime
+from src.core.models.trip import TripRequirement
+from src.core.planner.strategy import BasePlanningStrategy
+from src.core.planner.system import TripPlanningSystem
+from src.core.services.time_service import TimeService
+from src.core.utils.validator import TripValidator
+
+
+TEST_LOCATIONS = [
+    {
+        "name": "台北101",
+        "rating": 4.6,
+        "lat": 25.0339808,
+        "lon": 121.561964,
+        "duration": 120,
+        "label": "景點",
+        "period": "morning",
+        "hours": {i: [{'start': '09:00', 'end': '22:00'}] for i in range(1, 8)}
+    },
+    {
+        "name": "鼎泰豐",
+        "rating": 4.8,
+        "lat": 25.0329,
+        "lon": 121.5604,
+        "duration": 90,
+        "label": "餐廳",
+        "period": "lunch",
+        "hours": {i: [{'start': '11:00', 'end': '21:00'}] for i in range(1, 8)}
+    },
+    {
+        "name": "國立故宮博物院",
+        "rating": 4.7,
+        "lat": 25.1023,
+        "lon": 121.5482,
+        "duration": 120,
+        "label": "景點",
+        "period": "afternoon",
+        "hours": {i: [{'start': '08:30', 'end': '18:30'}] for i in range(1, 8)}
+    },
+]
+
+
+def test_prepare_places_cache():
+    """測試重複使用同一份地點列表時沿用轉換結果"""
+    system = TripPlanningSystem()
+    places, arrays = system._prepare_places(TEST_LOCATIONS)
+
+    # 同一份列表直接回傳快取
+    cached_places, cached_arrays = system._prepare_places(TEST_LOCATIONS)
+    assert cached_places is places
+    assert cached_arrays is arrays
+
+    # 內容不同的列表會重新轉換
+    other_places, _ = system._prepare_places(list(TEST_LOCATIONS))
+    assert other_places is not places
+
+    # 清除快取後重新轉換
+    system.clear_cache()
+    assert system._prepare_places(TEST_LOCATIONS)[0] is not places
+
+
+def test_plan_trip_starts_and_ends_at_start_point():
+    """測試行程以起點開始並回到起點"""
+    system = TripPlanningSystem()
+    itinerary = system.plan_trip(
+        TEST_LOCATIONS,
+        {"start_time": "09:00", "end_time": "18:00"}
+    )
+
+    assert itinerary[0]['name'] == "台北車站"
+    assert itinerary[-1]['name'] == "台北車站"
+    assert len(itinerary) >= 3
+
+    # 執行時間同時以秒數與整數奈秒數記錄
+    assert isinstance(system.execution_time_ns, int)
+    assert system.execution_time == system.execution_time_ns / 1e9
+
+    # 規劃時直接編好順序，不需要事後重新編號
+    assert [plan['step'] for plan in itinerary] == list(range(len(itinerary)))
+
+    # 分鐘數欄位與字串欄位一致
+    for plan in itinerary:
+        assert TimeService.format_minutes(plan['start_min']) == plan['start_time']
+        assert TimeService.format_minutes(plan['end_min']) == plan['end_time']
+
+
+def test_summarize_itinerary():
+    """測試行程統計的總停留時間與總交通時間"""
+    system = TripPlanningSystem()
+    itinerary = system.plan_trip(
+        TEST_LOCATIONS,
+        {"start_time": "09:00", "end_time": "18:00"}
+    )
+    summary = TripPlanningSystem.summarize(itinerary)
+
+    assert summary['total_duration'] == sum(
+        plan['duration'] for plan in itinerary)
+    assert summary['total_travel_time'] == sum(
+        plan['transport']['time'] for plan in itinerary)
+
+
+def test_plan_trip_stops_when_no_time_left(monkeypatch):
+    """測試剩餘時間少於最短停留時間時，不再挑選候選地點"""
+    calls = []
+    original = BasePlanningStrategy.select_next_place
+
+    def counting_select(self, *args, **kwargs):
+        calls.append(args)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(BasePlanningStrategy, "select_next_place", counting_select)
+    itinerary = TripPlanningSystem().plan_trip(
+        TEST_LOCATIONS, {"start_time": "09:00", "end_time": "10:00"})
+
+    # 最短停留 90 分鐘，一小時內排不進任何地點
+    assert [plan['name'] for plan in itinerary] == ["台北車站"]
+    assert calls == []
+
+
+def test_plan_trip_reuses_time_service():
+    """測試用餐時間不變時沿用時間服務，改變時評分服務跟著更新"""
+    system = TripPlanningSystem()
+    requirement = {"start_time": "09:00", "end_time": "18:00"}
+
+    system.plan_trip(TEST_LOCATIONS, requirement)
+    time_service = system.time_service
+    system.plan_trip(TEST_LOCATIONS, requirement)
+    assert system.time_service is time_service
+
+    system.plan_trip(TEST_LOCATIONS, {**requirement, "lunch_time": "11:30"})
+    assert system.time_service is not time_service
+    assert system.place_scoring.time_service is system.time_service
+    assert system.strategy.time_service is system.time_service
+
+
+def test_plan_trip_reuses_distance_matrix(monkeypatch):
+    """測試同一份地點列表與相同交通方式重複規劃時不重建距離矩陣"""
+    from src.core.services.geo_service import GeoService
+
+    calls = []
+    build = GeoService.build_distance_matrix
+
+    def counting_build(self, *args, **kwargs):
+        calls.append(kwargs.get('mode'))
+        return build(self, *args, **kwargs)
+
+    monkeypatch.setattr(GeoService, 'build_distance_matrix', counting_build)
+
+    system = TripPlanningSystem()
+    requirement = {"start_time": "09:00", "end_time": "18:00"}
+    system.plan_trip(TEST_LOCATIONS, requirement)
+    system.plan_trip(TEST_LOCATIONS, requirement)
+    assert len(calls) == 1
+
+    system.plan_trip(TEST_LOCATIONS, {**requirement, "transport_mode": "walking"})
+    assert calls == ["driving", "walking"]
+
+
+def test_plan_trip_uses_trip_date_weekday():
+    """測試指定出發日期時，依當天星期幾檢查營業時間"""
+    sunday_only = {
+        "name": "假日市集",
+        "rating": 4.5,
+        "lat": 25.0408,
+        "lon": 121.5210,
+        "duration": 60,
+        "label": "景點",
+        "period": "morning",
+        "hours": {7: [{'start': '08:00', 'end': '20:00'}]}
+    }
+    system = TripPlanningSystem()
+    requirement = {"start_time": "09:00", "end_time": "12:00"}
+
+    # 未指定日期時沿用預設（週一），市集不營業
+    itinerary = system.plan_trip([sunday_only], requirement)
+    assert "假日市集" not in [plan['name'] for plan in itinerary]
+
+    # 找一個會落在週日的日期
+    date = next(
+        d for d in ("01-04", "01-05", "01-06", "01-07", "01-08", "01-09", "01-10")
+        if TimeService.parse_trip_date(d).isoweekday() == 7
+    )
+    itinerary = system.plan_trip([sunday_only], {**requirement, "date": date})
+    assert "假日市集" in [plan['name'] for plan in itinerary]
+
+
+def test_plan_trip_reports_closed_candidates(capsys):
+    """測試時段有地點但都未營業時，輸出與沒有地點不同的訊息"""
+    closed_on_monday = {
+        "name": "假日市集",
+        "lat": 25.0408,
+        "lon": 121.5210,
+        "duration": 60,
+        "label": "景點",
+        "period": "morning",
+        "hours": {7: [{'start': '08:00', 'end': '20:00'}]}
+    }
+    system = TripPlanningSystem()
+    system.plan_trip([closed_on_monday], {"start_time": "09:00", "end_time": "12:00"})
+
+    out = capsys.readouterr().out
+    assert "符合morning時段的地點目前都未營業" in out
+    assert "沒有符合morning時段的地點" not in out
+
+def test_plan_trip_rejects_end_before_start():
+    """測試結束時間不晚於開始時間時拋出錯誤，時間以分鐘數比較"""
+    system = TripPlanningSystem()
+
+    with pytest.raises(ValueError):
+        system.plan_trip(TEST_LOCATIONS, {"start_time": "18:00", "end_time": "09:00"})
+
+    # 單位數小時以字串比較會誤判為較晚
+    start_time, end_time = system._get_trip_times(
+        {"start_time": "9:00", "end_time": "10:00"})
+    assert (start_time.hour, end_time.hour) == (9, 10)
+
+
+def test_plan_trip_accepts_trip_requirement():
+    """測試直接傳入 TripRequirement，"none" 欄位沿用預設值"""
+    requirement = TripRequirement(
+        start_time="09:00",
+        end_time="18:00",
+        start_point="台北車站",
+        end_point="none",
+        transport_mode="driving",
+        distance_threshold=30,
+        breakfast_time="none",
+        lunch_time="12:00",
+        dinner_time="18:00",
+        budget="none",
+        date="none"
+    )
+    system = TripPlanningSystem()
+    itinerary = system.plan_trip(TEST_LOCATIONS, requirement)
+
+    assert itinerary == system.plan_trip(
+        TEST_LOCATIONS, {"start_time": "09:00", "end_time": "18:00"})
+
+
+def test_parse_trip_date():
+    """測試出發日期取今天或之後最近的一天"""
+    today = datetime(2023, 3, 1)
+
+    assert TimeService.parse_trip_date("12-25", today) == datetime(2023, 12, 25)
+    assert TimeService.parse_trip_date("01-01", today) == datetime(2024, 1, 1)
+    assert TimeService.parse_trip_date("02-29", today) == datetime(2024, 2, 29)
+
+
+def test_time_string_parsing():
+    """測試不經過 strptime 的時間解析結果"""
+    assert TimeService.to_minutes("09:30") == 570
+    assert TimeService.to_minutes("9:30") == TripValidator.time_to_minutes("9:30") == 570
+
+    # TimeService 的驗證保留 strptime 的寬鬆規則，接受一位數的小時
+    assert TimeService().validate_time_range("9:30", "17:00")
+    assert not TripValidator.validate_time_string("9:30")
+    assert TimeService.to_time("21:05") == datetime(1900, 1, 1, 21, 5).time()
+
+    service = TimeService(lunch_time="12:30", dinner_time="18:00")
+    assert service.lunch_time == datetime(1900, 1, 1, 12, 30).time()
+    assert service.is_business_hours(
+        "10:00", {1: [{'start': '09:00', 'end': '17:00'}]}, 60) == (True, 60)
+
+
+def test_get_time_period():
+    """測試時段判斷，用餐時段包含前後一小時的邊界"""
+    service = TimeService(lunch_time="12:00", dinner_time="18:00")
+    cases = {
+        "10:59": "morning", "11:00": "lunch", "13:00": "lunch",
+        "13:01": "afternoon", "16:59": "afternoon", "17:00": "dinner",
+        "19:00": "dinner", "19:01": "night",
+    }
+    for time_str, period in cases.items():
+        assert service.get_time_period(time_str) == period
+
+    # 超過邊界不足一分鐘也算下一個時段
+    assert service.get_time_period(datetime(2024, 1, 1, 13, 0, 30)) == "afternoon"
+
+    # 午餐與晚餐相連時沿用逐一比較的判斷方式
+    adjacent = TimeService(lunch_time="12:00", dinner_time="14:00")
+    assert adjacent.get_time_period("13:00") == "lunch"
+    assert adjacent.get_time_period("14:30") == "dinner"
+
+
+def test_plan_many():
+    """測試平行規劃多組情境，結果順序與情境一致"""
+    system = TripPlanningSystem()
+    scenarios = [
+        (TEST_LOCATIONS, {"start_time": "09:00", "end_time": "18:00"}),
+        (TEST_LOCATIONS, {"start_time": "09:00", "end_time": "09:30"}),
+    ]
+    results = system.plan_many(scenarios, max_workers=2)
+
+    assert len(results) == 2
+    for itinerary in results:
+        assert itinerary[0]['name'] == "台北車站"
+        assert itinerary[-1]['name'] == "台北車站"
+
+    # 時間太短的情境只有起點與終點
+    assert len(results[0]) > len(results[1])
+
+
+def test_plan_trip_geocodes_start_and_end(monkeypatch):
+    """測試起點與終點一次查詢座標，失敗時改用預設起點"""
+    system = TripPlanningSystem()
+    coords = {"中壢火車站": (24.9537, 121.2257), "台北101": (25.0339808, 121.561964)}
+    calls = []
+
+    def fake_geocode(address):
+        calls.append(address)
+        if address not in coords:
+            raise RuntimeError(f"找不到地點: {address}")
+        lat, lon = coords[address]
+        return {'lat': lat, 'lon': lon}
+
+    monkeypatch.setattr(system.geo_service, "geocode", fake_geocode)
+
+    itinerary = system.plan_trip(TEST_LOCATIONS, {
+        "start_time": "09:00",
+        "end_time": "18:00",
+        "start_point": "中壢火車站",
+        "end_point": "台北101",
+    })
+    assert sorted(calls) == ["中壢火車站", "台北101"]
+    assert itinerary[0]['name'] == "中壢火車站"
+    assert itinerary[-1]['name'] == "台北101"
+
+    # 終點為預設起點時不需要查詢
+    calls.clear()
+    itinerary = system.plan_trip(TEST_LOCATIONS, {
+        "start_time": "09:00",
+        "end_time": "18:00",
+        "start_point": "中壢火車站",
+        "end_point": "台北車站",
+    })
+    assert calls == []
+    assert itinerary[-1]['name'] == "台北車站"
+
+    # 查詢失敗的起點改用台北車站
+    itinerary = system.plan_trip(TEST_LOCATIONS, {
+        "start_time": "09:00",
+        "end_time": "18:00",
+        "start_point": "不存在的地點",
+    })
+    assert itinerary[0]['name'] == "台北車站"
+
+
+def test_start_location_cache(monkeypatch):
+    """測試起點只查詢一次座標，預設起點在多次規劃間共用"""
+    system = TripPlanningSystem()
+    calls = []
+
+    def fake_geocode(address):
+        calls.append(address)
+        return {'lat': 24.9537, 'lon': 121.2257}
+
+    monkeypatch.setattr(system.geo_service, "geocode", fake_geocode)
+    requirement = {"start_time": "09:00", "end_time": "18:00",
+                   "start_point": "中壢火車站"}
+
+    system.plan_trip(TEST_LOCATIONS, requirement)
+    first = system.start_location
+    system.plan_trip(TEST_LOCATIONS, requirement)
+    assert calls == ["中壢火車站"]
+    assert system.start_location is first
+
+    system.plan_trip(TEST_LOCATIONS, {"start_time": "09:00", "end_time": "18:00"})
+    default = system.start_location
+    system.plan_trip(TEST_LOCATIONS, {"start_time": "09:00", "end_time": "18:00"})
+    assert system.start_location is default
+
+    # 預設起點在不同的規劃系統之間也是同一個物件
+    other = TripPlanningSystem()
+    other.plan_trip(TEST_LOCATIONS, {"start_time": "09:00", "end_time": "18:00"})
+    assert other.start_location is default
+
+
+def test_services_created_lazily():
+    """測試地理與評分服務在第一次使用時才建立"""
+    system = TripPlanningSystem()
+    assert 'geo_service' not in vars(system)
+    assert 'place_scoring' not in vars(system)
+
+    assert system.place_scoring.geo_service is system.geo_service
+    assert system.geo_service is system.geo_service
+
+
+def test_print_itinerary_silent(monkeypatch, capsys):
+    """測試設定 TRIP_SILENT 時不輸出行程結果"""
+    import src.core.planner.system as system_module
+
+    system = TripPlanningSystem()
+
+    monkeypatch.setattr(system_module, '_SILENT', True)
+    system.print_itinerary([])
+    assert capsys.readouterr().out == ""
+
+    monkeypatch.setattr(system_module, '_SILENT', False)
+    system.print_itinerary([])
+    assert "行程規劃結果" in capsys.readouterr().out
@@ -0,0 +1,84 @@
+from datetime import datetime
+from src.core.services.geo_service import GeoService
+
+
+def test_find_points_in_range():
+    """測試範圍搜尋結果與逐點計算一致，並依距離排序"""
+    center = {'lat': 25.0478, 'lon': 121.5170}
+    points = [
+        {'name': '故宮博物院', 'lat': 25.1023, 'lon': 121.5482},
+        {'name': '台北101', 'lat': 25.0339808, 'lon': 121.561964},
+        {'name': '高雄車站', 'lat': 22.6394, 'lon': 120.3022},
+    ]
+
+    geo_service = GeoService()
+    nearby = geo_service.find_points_in_range(center, points, 10)
+
+    assert [point['name'] for point in nearby] == ['台北101', '故宮博物院']
+    for point in nearby:
+        assert point['distance'] == GeoService.calculate_distance(center, point)
+
+    assert geo_service.find_points_in_range(center, [], 10) == []
+
+
+def test_get_route_cache_with_keyword_arguments():
+    """測試以關鍵字參數呼叫時路線也會被快取，交通方式不同則分開快取"""
+    geo_service = GeoService()
+    GeoService.get_route.cache_clear()
+    origin = {'lat': 25.0478, 'lon': 121.5170}
+    destination = {'lat': 25.0339808, 'lon': 121.561964}
+
+    route = geo_service.get_route(
+        origin=origin, destination=destination, mode='driving')
+    assert geo_service.get_route(
+        origin=dict(origin), destination=destination, mode='driving') is route
+    assert geo_service.get_route(origin, destination, 'driving') is route
+
+    walking = geo_service.get_route(
+        origin=origin, destination=destination, mode='walking')
+    assert walking is not route
+    assert GeoService.get_route.cache_info()['size'] == 2
+    GeoService.get_route.cache_clear()
+
+
+def test_get_route_cache_by_departure_time():
+    """測試出發時間在同一個 15 分鐘區間內共用快取，不同區間分開快取"""
+    geo_service = GeoService()
+    GeoService.get_route.cache_clear()
+    origin = {'lat': 25.0478, 'lon': 121.5170}
+    destination = {'lat': 25.0339808, 'lon': 121.561964}
+
+    route = geo_service.get_route(
+        origin, destination, 'transit', datetime(2024, 1, 1, 9, 0))
+    assert geo_service.get_route(
+        origin=origin, destination=destination, mode='transit',
+        departure_time=datetime(2024, 1, 1, 9, 14)) is route
+    assert geo_service.get_route(
+        origin, destination, 'transit', datetime(2024, 1, 1, 9, 15)) is not route
+    assert GeoService.get_route.cache_info()['size'] == 2
+    GeoService.get_route.cache_clear()
+
+def test_get_route_with_precomputed_distance():
+    """測試傳入已算好的直線距離時，預估路線直接沿用該距離"""
+    geo_service = GeoService()
+    GeoService.get_route.cache_clear()
+    origin = {'lat': 25.0478, 'lon': 121.5170}
+    destination = {'lat': 25.0339808, 'lon': 121.561964}
+
+    expected = geo_service._calculate_estimated_travel_info(
+        origin, destination, 'driving')
+    route = geo_service.get_route(
+        origin=origin, destination=destination, mode='driving',
+        distance=GeoService.calculate_distance(origin, destination))
+    assert route == expected
+
+    # 已算好的距離不同時，結果依傳入的距離換算，且不會取到其他距離的快取
+    far = geo_service.get_route(
+        origin=origin, destination=destination, mode='driving', distance=10.0)
+    assert far['distance_km'] == 13.0
+    farther = geo_service.get_route(
+        origin, destination, 'driving', None, 20.0)
+    assert farther['distance_km'] == 26.0
+    assert geo_service.get_route(
+        origin=origin, destination=destination, mode='driving') is not far
+    GeoService.get_route.cache_clear()
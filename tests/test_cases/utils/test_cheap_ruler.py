@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+from src.core.utils.cheap_ruler import CheapRuler
+
+
+def test_distance_matrix_matches_pairwise():
+    """測試向量化距離矩陣與逐點計算結果一致，包含跨越 180 度經線的情況"""
+    for lon in ([121.5170, 121.561964, 121.5482],
+                [179.9, -179.9, 179.5]):
+        lat = np.array([25.0478, 25.0339808, 25.1023])
+        lon = np.array(lon)
+        ruler = CheapRuler(float(lat.mean()))
+        matrix = ruler.distance_matrix(lat, lon)
+
+        for i in range(len(lat)):
+            for j in range(len(lat)):
+                assert matrix[i, j] == pytest.approx(ruler.distance(
+                    {'lat': lat[i], 'lon': lon[i]},
+                    {'lat': lat[j], 'lon': lon[j]}), abs=1e-9)
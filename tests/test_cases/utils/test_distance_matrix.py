@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+from src.core.models.place import PlaceDetail
+from src.core.utils.distance_matrix import DistanceMatrix
+
+
+def _make_place(name: str, lat: float, lon: float) -> PlaceDetail:
+    """建立測試用的地點"""
+    return PlaceDetail(
+        name=name,
+        lat=lat,
+        lon=lon,
+        duration=60,
+        label="景點",
+        period="morning",
+        hours={1: [{'start': '09:00', 'end': '17:00'}]}
+    )
+
+
+def test_distance_matrix_values():
+    """測試距離矩陣與逐點 Haversine 計算結果一致"""
+    places = [
+        _make_place("台北車站", 25.0478, 121.5170),
+        _make_place("台北101", 25.0339808, 121.561964),
+        _make_place("故宮博物院", 25.1023, 121.5482),
+    ]
+    matrix = DistanceMatrix(places)
+
+    # 對角線為 0，且矩陣對稱
+    assert matrix.distance(places[0], places[0]) == 0
+    assert matrix.distance(places[0], places[1]) == pytest.approx(
+        matrix.distance(places[1], places[0]))
+
+    # 台北車站到台北101約 4.8 公里
+    assert matrix.distance(places[0], places[1]) == pytest.approx(4.8, abs=0.1)
+
+
+def test_distance_matrix_unknown_place():
+    """測試不在矩陣中的地點回傳 None"""
+    places = [_make_place("台北車站", 25.0478, 121.5170)]
+    other = _make_place("台北101", 25.0339808, 121.561964)
+    matrix = DistanceMatrix(places)
+
+    assert matrix.index_of(other) is None
+    assert matrix.distance(places[0], other) is None
+
+
+def test_cheap_ruler_matches_haversine():
+    """測試 CheapRuler 近似結果與 Haversine 公式誤差在 0.5% 內"""
+    places = [
+        _make_place("台北車站", 25.0478, 121.5170),
+        _make_place("台北101", 25.0339808, 121.561964),
+        _make_place("故宮博物院", 25.1023, 121.5482),
+        _make_place("中壢火車站", 24.9537, 121.2257),
+    ]
+    approx = DistanceMatrix(places)
+    exact = DistanceMatrix(places, use_haversine=True)
+
+    assert approx.distances == pytest.approx(exact.distances, rel=5e-3)
+
+
+def test_travel_time_matrix():
+    """測試依速度換算的交通時間矩陣"""
+    places = [
+        _make_place("台北車站", 25.0478, 121.5170),
+        _make_place("台北101", 25.0339808, 121.561964),
+    ]
+    matrix = DistanceMatrix(places, speed_kmh=30, time_factor=1.5)
+    distance = matrix.distance(places[0], places[1])
+
+    # 30 km/h 即每公里 2 分鐘，再乘上修正係數
+    assert matrix.travel_time(places[0], places[1]) == pytest.approx(
+        distance * 2 * 1.5, rel=1e-5)
+
+    # 未設定速度時沒有交通時間矩陣
+    assert DistanceMatrix(places).travel_time(places[0], places[1]) is None
+
+
+def test_distance_matrix_max_distance():
+    """測試距離上限外的組合記為 inf，上限內的距離不受影響"""
+    places = [
+        _make_place("台北車站", 25.0478, 121.5170),
+        _make_place("台北101", 25.0339808, 121.561964),
+        _make_place("高雄車站", 22.6394, 120.3022),
+    ]
+    for use_haversine in (False, True):
+        full = DistanceMatrix(places, use_haversine=use_haversine)
+        matrix = DistanceMatrix(places, use_haversine=use_haversine,
+                                max_distance=30, speed_kmh=30)
+
+        assert matrix.distance(places[0], places[2]) == float('inf')
+        assert matrix.travel_time(places[2], places[1]) == float('inf')
+        assert matrix.distance(places[0], places[1]) == pytest.approx(
+            full.distance(places[0], places[1]))
+
+    # CheapRuler 直接以距離判斷，上限內的組合都保留，超出的都記為 inf
+    matrix = DistanceMatrix(places, max_distance=4.0)
+    assert matrix.distance(places[0], places[1]) == float('inf')
+    assert np.isinf(matrix.distances[~np.eye(3, dtype=bool)]).all()
+
+
+def test_distance_matrix_coordinates():
+    """測試一次取出所有地點的經緯度陣列"""
+    places = [
+        _make_place("台北車站", 25.0478, 121.5170),
+        _make_place("台北101", 25.0339808, 121.561964),
+    ]
+    lat, lon = DistanceMatrix.coordinates(places)
+
+    assert lat.dtype == np.float64
+    assert lat.tolist() == [25.0478, 25.0339808]
+    assert lon.tolist() == [121.5170, 121.561964]
+
+
+def test_distance_matrix_indices_of():
+    """測試一次查詢多個地點的索引"""
+    places = [
+        _make_place("台北車站", 25.0478, 121.5170),
+        _make_place("台北101", 25.0339808, 121.561964),
+    ]
+    other = _make_place("故宮博物院", 25.1023, 121.5482)
+    matrix = DistanceMatrix(places)
+
+    assert matrix.indices_of([places[1], places[0]]).tolist() == [1, 0]
+    assert matrix.indices_of([places[0], other]) is None
+
+
+def test_haversine_matrix_matches_pairwise():
+    """測試向量化的 Haversine 矩陣與逐對計算結果一致"""
+    lat = np.array([25.0478, 25.0339808, 25.1023, 22.6394])
+    lon = np.array([121.5170, 121.561964, 121.5482, 120.3022])
+    matrix = DistanceMatrix.haversine_matrix(lat, lon)
+
+    for i in range(len(lat)):
+        for j in range(len(lat)):
+            assert matrix[i, j] == pytest.approx(
+                DistanceMatrix.haversine(lat[i], lon[i], lat[j], lon[j]),
+                abs=1e-9)
+
+
+def test_bounding_box_row():
+    """測試單一起點的邊界框篩選不會排除上限內的地點"""
+    lat = np.array([25.0339808, 25.1023, 22.6394])
+    lon = np.array([121.561964, 121.5482, 120.3022])
+    mask = DistanceMatrix.bounding_box_row(25.0478, 121.5170, lat, lon, 30)
+
+    assert mask.tolist() == [True, True, False]
+    distances = DistanceMatrix.haversine(25.0478, 121.5170, lat, lon)
+    assert (distances[~mask] > 30).all()
+    assert DistanceMatrix.bounding_box_row(
+        25.0, 121.5, np.zeros(0), np.zeros(0), 30).tolist() == []
@@ -0,0 +1,59 @@
+import pytest
+from src.core.utils.validator import TripValidator, ValidationError
+
+
+@pytest.mark.parametrize("time_str, expected", [
+    ("09:30", True),
+    ("00:00", True),
+    ("23:59", True),
+    ("none", True),
+    ("24:00", False),
+    ("12:60", False),
+    ("9:30", False),
+    ("09-30", False),
+    ("ab:cd", False),
+    ("", False),
+    ("1²:00", False),
+    ("０9:00", False),
+])
+def test_validate_time_string(time_str, expected):
+    """測試時間字串格式驗證"""
+    assert TripValidator.validate_time_string(time_str) is expected
+
+
+def test_validate_time_range():
+    """測試時間範圍驗證，允許跨日營業"""
+    assert TripValidator.validate_time_range("09:00", "17:00")
+    assert TripValidator.validate_time_range("22:00", "02:00")
+    assert not TripValidator.validate_time_range("09:00", "09:00")
+    assert not TripValidator.validate_time_range("09:00", "25:00")
+
+
+@pytest.mark.parametrize("date_str, expected", [
+    ("12-25", True),
+    ("01-01", True),
+    ("none", True),
+    ("13-01", False),
+    ("12-32", False),
+    ("1-01", False),
+])
+def test_validate_date_string(date_str, expected):
+    """測試日期字串格式驗證"""
+    assert TripValidator.validate_date_string(date_str) is expected
+
+
+def test_validate_place_missing_fields():
+    """測試地點缺少必要欄位時列出缺少的欄位"""
+    place = {
+        "name": "台北101",
+        "lat": 25.0339,
+        "lon": 121.5619,
+        "duration": 90,
+        "label": "景點",
+        "period": "morning"
+    }
+    TripValidator.validate_place(place)
+
+    with pytest.raises(ValidationError, match="period"):
+        TripValidator.validate_place(
+            {k: v for k, v in place.items() if k != "period"})